@@ -0,0 +1,191 @@
+"""A prebuilt bundle of the API reference data introspected from reflex.
+
+The component library pages and the API reference pages document reflex
+classes by reading their source. The results are stored in a JSON bundle, so
+a warm start reads the bundle instead of parsing any source. Each entry records
+a digest of the source files that define the class and its bases, and is
+recomputed when any of them changes, even if the package version does not
+(e.g. reflex installed from git). The bundle file is keyed by the source of the
+modules that extract the entries, so editing them starts a new bundle.
+
+Generate the bundle ahead of time (e.g. before `reflex export` in CI) with:
+
+    python -m pcweb.api_reference
+
+Otherwise it is filled in and saved on the first start.
+"""
+
+import atexit
+import functools
+import inspect
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Callable
+
+from pcweb.cache import CACHE_DIR, CACHE_DISABLED, hash_bytes
+
+# The modules that extract the entries, relative to the pcweb package.
+EXTRACTORS = ("api_reference.py", "pages/docs/component.py", "pages/docs/source.py")
+
+# The kinds of entries in the bundle: the props and custom event triggers (with
+# their argument names) of the library components, and the fields and methods of
+# the API reference classes.
+KINDS = ("props", "triggers", "fields", "class_fields", "methods")
+
+
+def get_bundle_path() -> Path:
+    """Get the path of the bundle for the current source of the extractors."""
+    package = Path(__file__).resolve().parent
+    digest = hash_bytes(
+        b"".join((package / extractor).read_bytes() for extractor in EXTRACTORS)
+    )
+    return CACHE_DIR / f"api_reference-{digest[:16]}.json"
+
+
+def get_key(cls: type) -> str:
+    """Get the bundle key of a class."""
+    return f"{cls.__module__}.{cls.__qualname__}"
+
+
+@functools.cache
+def get_file_digest(path: str) -> str:
+    """Get the content hash of a source file."""
+    return hash_bytes(Path(path).read_bytes())
+
+
+@functools.cache
+def get_source_digest(cls: type) -> str:
+    """Get a digest of the source files that define a class and its bases.
+
+    Args:
+        cls: The class.
+
+    Returns:
+        The digest, which changes whenever one of the files does.
+    """
+    digests = []
+    for base in cls.__mro__:
+        try:
+            path = inspect.getsourcefile(base)
+        except TypeError:
+            # Builtin classes have no source.
+            continue
+        if path is not None:
+            digests.append(f"{path}:{get_file_digest(path)}")
+    return hash_bytes("\n".join(dict.fromkeys(digests)).encode())
+
+
+class Bundle:
+    """The API reference entries, loaded from and saved to a JSON file."""
+
+    def __init__(self, path: Path):
+        """Load the bundle.
+
+        Args:
+            path: The path to the bundle file.
+        """
+        self.path = path
+        self.entries: dict[str, dict[str, Any]] = {kind: {} for kind in KINDS}
+        self.dirty = False
+
+        if CACHE_DISABLED or not path.exists():
+            return
+        try:
+            data = json.loads(path.read_text())
+        except (OSError, ValueError):
+            return
+        for kind in KINDS:
+            self.entries[kind].update(data.get(kind, {}))
+
+    def get(self, kind: str, cls: type, compute: Callable[[], Any]) -> Any:
+        """Get the entry for a class, computing it if the bundle does not have it.
+
+        Args:
+            kind: The kind of entry.
+            cls: The documented class.
+            compute: Computes the entry. It must return JSON data.
+
+        Returns:
+            The entry.
+        """
+        if not self.has(kind, cls):
+            self.set(kind, cls, compute())
+        return self.entries[kind][get_key(cls)]["value"]
+
+    def has(self, kind: str, cls: type) -> bool:
+        """Check whether the bundle has an up to date entry for a class.
+
+        An entry is out of date once the source of the class or of one of its
+        bases has changed.
+        """
+        entry = self.entries[kind].get(get_key(cls))
+        return entry is not None and entry.get("digest") == get_source_digest(cls)
+
+    def set(self, kind: str, cls: type, value: Any):
+        """Store the entry for a class.
+
+        Args:
+            kind: The kind of entry.
+            cls: The documented class.
+            value: The entry. It must be JSON data.
+        """
+        self.entries[kind][get_key(cls)] = {
+            "digest": get_source_digest(cls),
+            "value": value,
+        }
+        if not self.dirty and not CACHE_DISABLED:
+            self.dirty = True
+            atexit.register(self.save)
+
+    def save(self):
+        """Write the bundle if it changed."""
+        if not self.dirty:
+            return
+        self.dirty = False
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+            with os.fdopen(fd, "w") as file:
+                json.dump(
+                    self.entries,
+                    file,
+                    indent=1,
+                    sort_keys=True,
+                )
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"Failed to write the API reference bundle {self.path}: {e}")
+
+
+_bundle: Bundle | None = None
+
+
+def get_bundle() -> Bundle:
+    """Get the process-wide bundle."""
+    global _bundle
+    if _bundle is None:
+        _bundle = Bundle(get_bundle_path())
+    return _bundle
+
+
+def generate():
+    """Build the bundle from scratch by building every page that reads it."""
+    global _bundle
+    _bundle = Bundle(get_bundle_path())
+    _bundle.entries = {kind: {} for kind in KINDS}
+
+    import pcweb.pages  # noqa: F401
+
+    _bundle.dirty = True
+    _bundle.save()
+    counts = ", ".join(f"{len(_bundle.entries[kind])} {kind}" for kind in KINDS)
+    print(f"Wrote {counts} to {_bundle.path}")
+
+
+if __name__ == "__main__":
+    # Run the generator from the imported module, which the pages use.
+    from pcweb.api_reference import generate
+
+    generate()
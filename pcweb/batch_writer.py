@@ -0,0 +1,136 @@
+"""A buffered writer that inserts rows into the database in batches.
+
+Event handlers add rows (e.g. feedback and newsletter signups) to the buffer,
+which a background task of the backend flushes with a single bulk insert once
+it holds enough rows or its oldest row has waited long enough. The insert runs
+in a thread, so it never blocks the event loop. The backend flushes the rest on
+shutdown.
+
+- REFLEX_WEB_WRITE_BATCH_SIZE: the number of rows that triggers a flush (default 50).
+- REFLEX_WEB_WRITE_BATCH_SECONDS: the longest a row waits to be written (default 5).
+"""
+
+import asyncio
+import contextlib
+import os
+import threading
+import time
+
+import reflex as rx
+
+# The number of rows that triggers a flush.
+BATCH_SIZE = int(os.environ.get("REFLEX_WEB_WRITE_BATCH_SIZE", 50))
+
+# The longest a row waits in the buffer, in seconds.
+BATCH_SECONDS = float(os.environ.get("REFLEX_WEB_WRITE_BATCH_SECONDS", 5))
+
+# The most rows kept for a retry when the database is unavailable.
+MAX_BUFFERED = 10_000
+
+
+class BatchWriter:
+    """Buffers rows and writes them with bulk inserts."""
+
+    def __init__(
+        self, batch_size: int = BATCH_SIZE, batch_seconds: float = BATCH_SECONDS
+    ):
+        """Create the writer.
+
+        Args:
+            batch_size: The number of rows that triggers a flush.
+            batch_seconds: The longest a row waits in the buffer, in seconds.
+        """
+        self.batch_size = batch_size
+        self.batch_seconds = batch_seconds
+        self.rows: list[rx.Model] = []
+        self.oldest: float | None = None
+        # Guards the buffer, which flushes swap out from their thread.
+        self.lock = threading.Lock()
+        # Held for a whole flush, so a failed batch is put back before the next one.
+        self.flushing = threading.Lock()
+        # Wakes the flusher when the buffer fills up.
+        self.wakeup = asyncio.Event()
+
+    def add(self, row: rx.Model):
+        """Add a row to the buffer, waking the flusher if the buffer is full.
+
+        Must be called from the event loop of the backend.
+
+        Args:
+            row: The row to insert.
+        """
+        with self.lock:
+            if not self.rows:
+                self.oldest = time.monotonic()
+            self.rows.append(row)
+            # Only wake on filling up, so the rows of a failed flush that are
+            # kept for a retry wait for the next flush by age.
+            full = len(self.rows) == self.batch_size
+        if full:
+            self.wakeup.set()
+
+    def is_due(self) -> bool:
+        """Whether the buffer should be flushed."""
+        with self.lock:
+            if not self.rows:
+                return False
+            return (
+                len(self.rows) >= self.batch_size
+                or time.monotonic() - self.oldest >= self.batch_seconds
+            )
+
+    def get_timeout(self) -> float:
+        """Get the seconds until the oldest row is due."""
+        with self.lock:
+            if self.oldest is None:
+                return self.batch_seconds
+            return max(0, self.oldest + self.batch_seconds - time.monotonic())
+
+    def flush(self):
+        """Insert the buffered rows.
+
+        This blocks on the database, so the backend runs it in a thread. If the
+        insert fails, the rows are put back at the front of the buffer for the
+        next flush.
+        """
+        with self.flushing:
+            with self.lock:
+                rows, self.rows = self.rows, []
+                self.oldest = None
+            if not rows:
+                return
+            try:
+                with rx.session() as session:
+                    session.add_all(rows)
+                    session.commit()
+            except Exception as e:
+                print(f"Failed to write {len(rows)} rows: {e}")
+                with self.lock:
+                    self.rows = (rows + self.rows)[-MAX_BUFFERED:]
+                    # Retry once the batch is due again.
+                    self.oldest = time.monotonic()
+
+    async def run(self):
+        """Flush the buffer whenever it is full or its oldest row is due."""
+        while True:
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self.wakeup.wait(), self.get_timeout())
+            self.wakeup.clear()
+            if self.is_due():
+                await asyncio.to_thread(self.flush)
+
+    @contextlib.asynccontextmanager
+    async def lifespan(self):
+        """Run the flusher while the backend runs, and flush the rest on shutdown."""
+        task = asyncio.create_task(self.run())
+        try:
+            yield
+        finally:
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+            # Waits for a flush the task left running.
+            await asyncio.to_thread(self.flush)
+
+
+writer = BatchWriter()
@@ -0,0 +1,240 @@
+"""On-disk caches that survive between `reflex run` / `reflex export` starts."""
+
+import atexit
+import copy
+import functools
+import hashlib
+import importlib.util
+import json
+import os
+import pickle
+import tempfile
+from importlib import metadata
+from pathlib import Path
+from typing import Any
+
+import flexdown
+
+# The directory the caches are stored in.
+CACHE_DIR = Path(os.environ.get("REFLEX_WEB_CACHE_DIR", ".web/pcweb_cache"))
+
+# Set this to disable reading and writing the on-disk caches.
+CACHE_DISABLED = bool(os.environ.get("REFLEX_WEB_DISABLE_CACHE", False))
+
+# Sentinel returned on a cache miss (None is a valid cached value).
+MISSING = object()
+
+
+def get_version(package: str) -> str:
+    """Get the installed version of a package.
+
+    Args:
+        package: The name of the package.
+
+    Returns:
+        The version, or an empty string if the package is not installed.
+    """
+    try:
+        return metadata.version(package)
+    except metadata.PackageNotFoundError:
+        return ""
+
+
+def hash_bytes(data: bytes) -> str:
+    """Get the content hash used as a cache digest."""
+    return hashlib.sha256(data).hexdigest()
+
+
+@functools.cache
+def get_source_version(package: str) -> str:
+    """Get the installed version of a package, down to its source.
+
+    The version string is not bumped by every change of a package installed
+    from git or from a local checkout, so these add the commit or a hash of
+    the source files of the package.
+
+    Args:
+        package: The name of the package.
+
+    Returns:
+        The version, or an empty string if the package is not installed.
+    """
+    try:
+        distribution = metadata.distribution(package)
+    except metadata.PackageNotFoundError:
+        return ""
+    try:
+        direct_url = json.loads(distribution.read_text("direct_url.json") or "{}")
+    except ValueError:
+        direct_url = {}
+
+    commit = direct_url.get("vcs_info", {}).get("commit_id")
+    if commit:
+        return f"{distribution.version}+{commit}"
+    if "dir_info" not in direct_url:
+        # Installed from an index, so the version pins the source.
+        return distribution.version
+
+    modules = [
+        module
+        for module, packages in metadata.packages_distributions().items()
+        if distribution.metadata["Name"] in packages
+    ] or [package.replace("-", "_")]
+    digest = hashlib.sha256()
+    for module in sorted(modules):
+        spec = importlib.util.find_spec(module)
+        if spec is None:
+            continue
+        if spec.submodule_search_locations:
+            paths = sorted(
+                path
+                for location in spec.submodule_search_locations
+                for path in Path(location).rglob("*.py")
+            )
+        else:
+            paths = [Path(spec.origin)] if spec.origin else []
+        for path in paths:
+            digest.update(path.read_bytes())
+    return f"{distribution.version}+{digest.hexdigest()[:16]}"
+
+
+class DiskCache:
+    """A pickled key-value store under the cache directory.
+
+    Each key holds a single value along with the digest it was computed from,
+    so a changed input replaces its old entry instead of piling up next to it.
+    The whole store is dropped when the version changes.
+    """
+
+    def __init__(self, name: str, version: str = ""):
+        """Load the store from disk.
+
+        Args:
+            name: The name of the store file.
+            version: The version of whatever produced the cached values.
+        """
+        self.path = CACHE_DIR / f"{name}.pkl"
+        self.version = version
+        self.entries: dict[str, tuple[str | None, Any]] = {}
+        self.dirty = False
+
+        if CACHE_DISABLED or not self.path.exists():
+            return
+        try:
+            with self.path.open("rb") as file:
+                version, entries = pickle.load(file)
+        except Exception:
+            # A corrupt or incompatible store is just a cold cache.
+            return
+        if version == self.version:
+            self.entries = entries
+
+    def get(self, key: str, digest: str | None = None) -> Any:
+        """Get a value from the store.
+
+        Args:
+            key: The key to look up.
+            digest: The digest of the current input, if any.
+
+        Returns:
+            The cached value, or MISSING if it is absent or stale.
+        """
+        entry = self.entries.get(key)
+        if entry is None or entry[0] != digest:
+            return MISSING
+        return entry[1]
+
+    def set(self, key: str, value: Any, digest: str | None = None):
+        """Store a value.
+
+        Args:
+            key: The key to store the value under.
+            value: The value to store. Must be picklable.
+            digest: The digest of the input the value was computed from.
+        """
+        self.entries[key] = (digest, value)
+        if not self.dirty and not CACHE_DISABLED:
+            self.dirty = True
+            atexit.register(self.save)
+
+    def delete(self, key: str):
+        """Remove a value from the store, if it is there.
+
+        Args:
+            key: The key of the value.
+        """
+        if self.entries.pop(key, None) is None:
+            return
+        if not self.dirty and not CACHE_DISABLED:
+            self.dirty = True
+            atexit.register(self.save)
+
+    def save(self):
+        """Write the store to disk if it changed."""
+        if not self.dirty:
+            return
+        self.dirty = False
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            # Write to a temp file and rename so concurrent builds never read a partial store.
+            fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+            with os.fdopen(fd, "wb") as file:
+                pickle.dump((self.version, self.entries), file)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"Failed to write cache {self.path}: {e}")
+
+
+_caches: dict[str, DiskCache] = {}
+
+
+def get_cache(name: str, version: str = "") -> DiskCache:
+    """Get the process-wide instance of a store.
+
+    Args:
+        name: The name of the store.
+        version: The version of whatever produced the cached values.
+
+    Returns:
+        The store.
+    """
+    if name not in _caches:
+        _caches[name] = DiskCache(name, version)
+    return _caches[name]
+
+
+def get_flexdown_cache() -> DiskCache:
+    """Get the store of parsed flexdown documents."""
+    return get_cache("flexdown", get_version("flexdown"))
+
+
+def parse_source(source: str) -> tuple[dict, str]:
+    """Parse flexdown source into its front matter and content."""
+    document = flexdown.parse(source)
+    return document.metadata, document.content
+
+
+def parse_file(path: str | Path) -> flexdown.Document:
+    """Parse a flexdown file, reusing the result from a previous start if unchanged.
+
+    Args:
+        path: The path to the flexdown file.
+
+    Returns:
+        The parsed document.
+    """
+    path = str(path)
+    source = Path(path).read_text(encoding="utf-8")
+    digest = hash_bytes(source.encode())
+    cache = get_flexdown_cache()
+
+    parsed = cache.get(path, digest)
+    if parsed is MISSING:
+        parsed = parse_source(source)
+        cache.set(path, parsed, digest)
+
+    metadata_, content = parsed
+    # Callers add entries to the metadata (it doubles as the exec env), so hand out a copy.
+    return flexdown.Document(
+        metadata=copy.deepcopy(metadata_), content=content, filename=path
+    )
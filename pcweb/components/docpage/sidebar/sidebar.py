@@ -168,31 +168,6 @@ def sidebar_item_comp(
     )
 
 
-def calculate_index(sidebar_items, url: str) -> list[int]:
-    sidebar_items = (
-        sidebar_items if isinstance(sidebar_items, list) else [sidebar_items]
-    )
-    index_list = []
-
-    if not url:
-        return index_list
-
-    url = url.rstrip("/") + "/"
-    for item in sidebar_items:
-        item.link = item.link.rstrip("/") + "/"
-    sub = 0
-    for i, item in enumerate(sidebar_items):
-        if not item.children:
-            sub += 1
-        if item.link == url:
-            return [i - sub]
-        index = calculate_index(item.children, url)
-        if index:
-            return [i - sub] + index
-
-    return index_list
-
-
 def append_to_items(items, flat_items):
     for item in items:
         if not item.children:
@@ -215,15 +190,21 @@ append_to_items(
 )
 
 
+# The position of each link in the flat list of sidebar items, for the previous
+# and next links.
+flat_index = {}
+for i, item in enumerate(flat_items):
+    flat_index.setdefault(item.link.strip("/"), i)
+
+
 def get_prev_next(url):
     """Get the previous and next links in the sidebar."""
-    url = url.strip("/")
-    for i, item in enumerate(flat_items):
-        if item.link.strip("/") == url:
-            prev_link = flat_items[i - 1] if i > 0 else None
-            next_link = flat_items[i + 1] if i < len(flat_items) - 1 else None
-            return prev_link, next_link
-    return None, None
+    i = flat_index.get(url.strip("/"))
+    if i is None:
+        return None, None
+    prev_link = flat_items[i - 1] if i > 0 else None
+    next_link = flat_items[i + 1] if i < len(flat_items) - 1 else None
+    return prev_link, next_link
 
 
 def filter_out_non_sidebar_items(items: list[SideBarBase]) -> list[SideBarItem]:
@@ -467,32 +448,61 @@ def sidebar_comp(
     )
 
 
+def build_section_index(
+    sidebar_items, index: dict[str, list[int]], path: list[int]
+) -> dict[str, list[int]]:
+    """Map the link of each item in a sidebar section to its accordion index.
+
+    The index of an item counts only the items with children before it, as the
+    leaves are not accordion items of their own.
+
+    Args:
+        sidebar_items: The items of the section.
+        index: The index to add the items to.
+        path: The accordion index of the parent item.
+
+    Returns:
+        The index.
+    """
+    sub = 0
+    for i, item in enumerate(sidebar_items):
+        item.link = item.link.rstrip("/") + "/"
+        if not item.children:
+            sub += 1
+        item_path = path + [i - sub]
+        # If a link shows up twice, the first item is the active one.
+        index.setdefault(item.link, item_path)
+        build_section_index(item.children, index, item_path)
+    return index
+
+
+# The accordion index of each link, per sidebar section.
+section_indices = {
+    name: build_section_index(items, {}, [])
+    for name, items in [
+        ("learn_index", learn),
+        ("component_lib_index", component_lib),
+        ("frontend_index", frontend),
+        ("backend_index", backend),
+        ("hosting_index", hosting),
+        ("graphing_libs_index", graphing_libs),
+        ("api_reference_index", api_reference),
+        ("recipes_index", recipes),
+        ("tutorials_index", tutorials),
+    ]
+}
+
+
+def get_sidebar_indices(url=None) -> dict[str, list[int]]:
+    """Get the index of the active item in each sidebar section."""
+    url = url.rstrip("/") + "/" if url else None
+    return {name: index.get(url, []) for name, index in section_indices.items()}
+
+
 def sidebar(url=None, width: str = "100%") -> rx.Component:
     """Render the sidebar."""
-    learn_index = calculate_index(learn, url)
-    component_lib_index = calculate_index(component_lib, url)
-    frontend_index = calculate_index(frontend, url)
-    backend_index = calculate_index(backend, url)
-    hosting_index = calculate_index(hosting, url)
-    graphing_libs_index = calculate_index(graphing_libs, url)
-    api_reference_index = calculate_index(api_reference, url)
-    recipes_index = calculate_index(recipes, url)
-    tutorials_index = calculate_index(tutorials, url)
-
     return rx.box(
-        sidebar_comp(
-            url=url,
-            learn_index=learn_index,
-            component_lib_index=component_lib_index,
-            frontend_index=frontend_index,
-            backend_index=backend_index,
-            hosting_index=hosting_index,
-            graphing_libs_index=graphing_libs_index,
-            api_reference_index=api_reference_index,
-            recipes_index=recipes_index,
-            tutorials_index=tutorials_index,
-            width=width,
-        ),
+        sidebar_comp(url=url, width=width, **get_sidebar_indices(url)),
         class_name="flex justify-end w-full h-full",
     )
 
@@ -0,0 +1,109 @@
+"""Content collections: the blog posts, templates and customer stories.
+
+The list pages only need the front matter of each document (titles, dates,
+images), so a collection is loaded by reading the front matter alone. Its YAML
+is parsed once per change and cached between starts, and the body of a
+document is only read when its page renders.
+"""
+
+import copy
+import re
+from pathlib import Path
+from typing import Any
+
+import flexdown
+import yaml
+
+from pcweb.cache import MISSING, get_cache, get_version, hash_bytes
+
+# The line that opens and closes the front matter.
+FRONT_MATTER_DELIMITER = re.compile(r"---\s*")
+
+
+def get_front_matter_cache():
+    """Get the store of parsed front matter."""
+    return get_cache("front_matter", get_version("pyyaml"))
+
+
+def read_front_matter(path: str) -> str:
+    """Read the front matter of a flexdown file, without reading its body.
+
+    Args:
+        path: The path to the file.
+
+    Returns:
+        The YAML source of the front matter, or an empty string if there is none.
+    """
+    with open(path, encoding="utf-8") as file:
+        if not FRONT_MATTER_DELIMITER.fullmatch(file.readline()):
+            return ""
+        lines = []
+        for line in file:
+            if FRONT_MATTER_DELIMITER.fullmatch(line):
+                return "".join(lines)
+            lines.append(line)
+    return ""
+
+
+def parse_front_matter(path: str) -> dict[str, Any]:
+    """Parse the front matter of a flexdown file, reusing the result from a previous start if unchanged.
+
+    Args:
+        path: The path to the file.
+
+    Returns:
+        The metadata of the document.
+    """
+    source = read_front_matter(path)
+    digest = hash_bytes(source.encode())
+    cache = get_front_matter_cache()
+
+    metadata = cache.get(path, digest)
+    if metadata is MISSING:
+        metadata = yaml.safe_load(source) or {}
+        cache.set(path, metadata, digest)
+    # Pages add entries to the metadata, so hand out a copy.
+    return copy.deepcopy(metadata)
+
+
+class ContentDocument:
+    """A document of a content collection, read like a flexdown document.
+
+    The body is read from the file on first use.
+    """
+
+    def __init__(self, filename: str, metadata: dict[str, Any]):
+        """Create the document.
+
+        Args:
+            filename: The path to the flexdown file.
+            metadata: The front matter of the document.
+        """
+        self.filename = filename
+        self.metadata = metadata
+        self._content: str | None = None
+
+    @property
+    def content(self) -> str:
+        """The body of the document."""
+        if self._content is None:
+            source = Path(self.filename).read_text(encoding="utf-8")
+            match = re.match(flexdown.constants.FRONT_MATTER_REGEX, source, re.DOTALL)
+            self._content = match.group(2) if match else source
+        return self._content
+
+
+def load_collection(directory: str) -> dict[str, ContentDocument]:
+    """Load the documents of a content collection, newest first.
+
+    Args:
+        directory: The directory of the collection.
+
+    Returns:
+        The documents, keyed by their path without the `.md` extension.
+    """
+    paths = flexdown.utils.get_flexdown_files(directory)
+    return {
+        path.replace(".md", "/"): ContentDocument(path, parse_front_matter(path))
+        for path in sorted(paths, reverse=True)
+    }
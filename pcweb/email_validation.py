@@ -0,0 +1,132 @@
+"""Async email validation for the newsletter signup.
+
+The syntax of an address is checked locally. The deliverability of its domain
+(an MX record, or an A/AAAA fallback) is looked up in a worker thread, so the
+DNS round trips never block the backend event loop, and the result is cached
+per domain. Addresses at common mail providers skip the lookup entirely.
+
+- REFLEX_WEB_EMAIL_OFFLINE: only check the syntax, without any DNS lookups.
+- REFLEX_WEB_EMAIL_DOMAIN_TTL: how long a domain lookup is cached, in seconds
+  (default 3600).
+"""
+
+import asyncio
+import os
+import time
+from typing import Callable
+
+from email_validator import EmailUndeliverableError, validate_email
+from email_validator.deliverability import validate_email_deliverability
+
+# Set this to only check the syntax of the addresses.
+OFFLINE = bool(os.environ.get("REFLEX_WEB_EMAIL_OFFLINE", False))
+
+# How long a domain lookup is cached, in seconds.
+DOMAIN_TTL = float(os.environ.get("REFLEX_WEB_EMAIL_DOMAIN_TTL", 3600))
+
+# The domains of common mail providers, which are known to accept email.
+COMMON_DOMAINS = frozenset(
+    [
+        "aol.com",
+        "fastmail.com",
+        "gmail.com",
+        "gmx.com",
+        "gmx.de",
+        "googlemail.com",
+        "hey.com",
+        "hotmail.com",
+        "icloud.com",
+        "live.com",
+        "mail.com",
+        "me.com",
+        "msn.com",
+        "outlook.com",
+        "proton.me",
+        "protonmail.com",
+        "qq.com",
+        "yahoo.com",
+        "yandex.com",
+        "zoho.com",
+    ]
+)
+
+
+def lookup_domain(domain: str, domain_i18n: str) -> str | None:
+    """Check whether a domain accepts email with a DNS lookup.
+
+    Args:
+        domain: The ASCII form of the domain.
+        domain_i18n: The domain as entered, for the error message.
+
+    Returns:
+        The error message if the domain does not accept email, or None.
+    """
+    try:
+        validate_email_deliverability(domain, domain_i18n)
+    except EmailUndeliverableError as e:
+        return str(e)
+    return None
+
+
+class DomainCache:
+    """A TTL cache of the domain lookups."""
+
+    def __init__(
+        self,
+        lookup: Callable[[str, str], str | None] = lookup_domain,
+        ttl: float = DOMAIN_TTL,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Create the cache.
+
+        Args:
+            lookup: Looks up a domain, returning an error message if it does not accept email.
+            ttl: How long a lookup is cached, in seconds.
+            clock: The clock the expiry times are measured with.
+        """
+        self.lookup = lookup
+        self.ttl = ttl
+        self.clock = clock
+        self.entries: dict[str, tuple[float, str | None]] = {}
+
+    async def check(self, domain: str, domain_i18n: str) -> str | None:
+        """Check whether a domain accepts email, using a cached lookup if there is one.
+
+        Args:
+            domain: The ASCII form of the domain.
+            domain_i18n: The domain as entered.
+
+        Returns:
+            The error message if the domain does not accept email, or None.
+        """
+        entry = self.entries.get(domain)
+        if entry is not None and entry[0] > self.clock():
+            return entry[1]
+        error = await asyncio.to_thread(self.lookup, domain, domain_i18n)
+        self.entries[domain] = (self.clock() + self.ttl, error)
+        return error
+
+
+domain_cache = DomainCache()
+
+
+async def validate(email: str) -> str:
+    """Validate an email address.
+
+    Args:
+        email: The address.
+
+    Returns:
+        The normalized address.
+
+    Raises:
+        EmailNotValidError: If the address is not valid or its domain does not accept email.
+    """
+    validated = validate_email(email, check_deliverability=False)
+    domain = validated.ascii_domain
+    if OFFLINE or domain in COMMON_DOMAINS:
+        return validated.normalized
+    error = await domain_cache.check(domain, validated.domain)
+    if error is not None:
+        raise EmailUndeliverableError(error)
+    return validated.normalized
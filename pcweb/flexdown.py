@@ -1,4 +1,11 @@
+import os
+import time
+
 import flexdown
+import sqlmodel
+from flexdown.flexdown import files as exec_files
+from pcweb import profiling
+from pcweb.cache import MISSING, get_cache, get_source_version, hash_bytes
 from pcweb.styles.colors import c_color
 
 import reflex as rx
@@ -17,6 +24,7 @@ from pcweb.templates.docpage import (
     text_comp,
     list_comp,
     definition,
+    get_headings,
     unordered_list_comp,
     ordered_list_comp,
 )
@@ -523,14 +531,196 @@ comp2["codeblock"] = code_block_markdown_dark
 comp2["ul"] = lambda items: unordered_list_comp(items=items)
 comp2["ol"] = lambda items: ordered_list_comp(items=items)
 
-    
 
-xd = flexdown.Flexdown(
+# New code blocks that take longer than this to run are reported.
+SLOW_EXEC_SECONDS = float(os.environ.get("REFLEX_WEB_SLOW_EXEC_SECONDS", "1"))
+
+
+def is_code_block(block: flexdown.blocks.Block) -> bool:
+    """Whether a block runs its code when executed."""
+    if isinstance(block, flexdown.blocks.ExecBlock):
+        return True
+    if isinstance(block, DemoBlock):
+        args = block.lines[0].removeprefix(block.starting_indicator).split()
+        return "exec" in args or "graphing" in args
+    return False
+
+
+def is_registered_class(value) -> bool:
+    """Whether a value is a class that registers itself globally: a state or a table."""
+    return isinstance(value, type) and (
+        issubclass(value, rx.State)
+        or (issubclass(value, sqlmodel.SQLModel) and hasattr(value, "__table__"))
+    )
+
+
+def get_exec_key(doc: str, index: int, block: flexdown.blocks.Block) -> str:
+    """Get the key of a code block in the exec cache.
+
+    Identical blocks in different docs, or at different positions of a doc,
+    are recorded separately.
+
+    Args:
+        doc: The path to the doc of the block.
+        index: The position of the block among the code blocks of the doc.
+        block: The code block.
+
+    Returns:
+        The key.
+    """
+    digest = hash_bytes("\n".join(block.lines).encode())
+    return f"{doc}:{index}:{digest}"
+
+
+def get_exec_cache():
+    """Get the store of what each code block cost and registered when it last ran."""
+    return get_cache("exec_blocks", get_source_version("reflex"))
+
+
+class Flexdown(flexdown.Flexdown):
+    """A flexdown instance that splits each document into blocks only once.
+
+    The exec pass and the render of a page walk the same blocks, and the
+    render pass collects the TOC of the page.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        # The blocks of each document, keyed by source and filename.
+        self.block_cache = {}
+
+    def get_blocks(self, source: str, filename: str | None = None):
+        key = (source, filename)
+        if key not in self.block_cache:
+            self.block_cache[key] = list(super().get_blocks(source, filename))
+        return iter(self.block_cache[key])
+
+    def render_block(
+        self, block: flexdown.blocks.Block, env: dict, key: str | None = None
+    ):
+        """Render a block, recording the cost and registrations of code blocks.
+
+        A code block registers something if it binds a state or table class,
+        whether it defines the class or imports it. A block that registered
+        something once stays recorded as such.
+
+        Args:
+            block: The block to render.
+            env: The environment to render the block in.
+            key: The key of the block in the exec cache, for code blocks.
+
+        Returns:
+            The rendered block.
+        """
+        if key is None:
+            return block.render(env=env)
+
+        cache = get_exec_cache()
+        info = cache.get(key)
+
+        names = dict(env)
+        start = time.perf_counter()
+        comp = block.render(env=env)
+        seconds = time.perf_counter() - start
+        registers = (info is not MISSING and info["registers"]) or any(
+            value is not names.get(name) and is_registered_class(value)
+            for name, value in env.items()
+        )
+        cache.set(key, {"seconds": seconds, "registers": registers})
+
+        if info is MISSING and seconds >= SLOW_EXEC_SECONDS:
+            print(
+                f"Code block on line {block.start_line_number} of {block.filename} "
+                f"took {seconds:.2f}s to run."
+            )
+        return comp
+
+    def get_required_code_blocks(
+        self, blocks: list[flexdown.blocks.Block], doc: str
+    ) -> list[flexdown.blocks.Block]:
+        """Get the code blocks that must run for a page that is not compiled.
+
+        Such a page only needs the states and tables its code blocks register.
+        Each block can use the names defined by the blocks before it, so this
+        is every block up to the last one that registers something, or that
+        has not run before.
+
+        Args:
+            blocks: The code blocks of the page.
+            doc: The path to the doc of the page.
+
+        Returns:
+            The leading blocks that must run.
+        """
+        cache = get_exec_cache()
+        required = 0
+        for i, block in enumerate(blocks):
+            info = cache.get(get_exec_key(doc, i, block))
+            if info is MISSING or info["registers"]:
+                required = i + 1
+        return blocks[:required]
+
+    def render_with_toc(
+        self, source: flexdown.Document, filename: str | None = None
+    ) -> tuple[list[tuple[int, str, str]], rx.Component]:
+        """Render a document, collecting the TOC entries of its headings on the way.
+
+        Args:
+            source: The document to render.
+            filename: The filename of the document.
+
+        Returns:
+            The TOC entries and the rendered page.
+        """
+        filename = filename or source.filename
+        if filename is not None:
+            self.clear_module(filename)
+            # Reset the per file exec block count for consistent hashing.
+            exec_files.pop(filename, None)
+
+        # The environment used for execing and evaling code.
+        env = source.metadata
+        env["__xd"] = self
+
+        # The code blocks are recorded under the doc they were parsed from.
+        doc = source.filename or filename
+        code_blocks = 0
+
+        toc = []
+        out = []
+        with profiling.phase("render", filename):
+            for block in self.get_blocks(source.content, filename):
+                is_markdown = isinstance(block, flexdown.blocks.MarkdownBlock)
+                if is_markdown:
+                    block.render_fn = self.flexdown_memo
+                key = None
+                if is_code_block(block):
+                    key = get_exec_key(doc, code_blocks, block)
+                    code_blocks += 1
+                try:
+                    comp = self.render_block(block, env, key)
+                    if comp:
+                        out.append(comp)
+                except Exception as e:
+                    print(
+                        f"Error while rendering {type(block)} on line {block.start_line_number}. "
+                        f"\n{block.get_content(env)}"
+                    )
+                    raise e
+                # The env is complete up to this block, so templates in headings resolve.
+                if is_markdown and block.lines and block.lines[0].startswith("#"):
+                    toc.extend(get_headings(block.get_content(env)))
+
+        return toc, self.page_template(rx.fragment(*out))
+
+
+xd = Flexdown(
     block_types=[DemoBlock, AlertBlock, DefinitionBlock, SectionBlock, VideoBlock, TabsBlock, QuoteBlock],
     component_map=component_map,
 )
 xd.clear_modules()
-xd2 = flexdown.Flexdown(
+xd2 = Flexdown(
     block_types=[DemoBlockDark, AlertBlock, DefinitionBlock, SectionBlock, VideoBlock, TabsBlock, QuoteBlock],
     component_map=comp2,
 )
@@ -0,0 +1,80 @@
+"""A shared async HTTP client for the outbound webhooks of the site.
+
+Event handlers post to Discord, Loops and Zapier through one pooled
+`httpx.AsyncClient`, so the round trips don't block the backend event loop and
+the connections to each endpoint are kept alive between requests.
+
+- REFLEX_WEB_HTTP_TIMEOUT: the timeout of each request in seconds (default 10).
+- REFLEX_WEB_HTTP_RETRIES: the number of times a failed connection is retried
+  (default 2). Requests that reached the server are never retried.
+"""
+
+import asyncio
+import contextlib
+import os
+
+import httpx
+
+# The timeout of each request, in seconds.
+TIMEOUT = float(os.environ.get("REFLEX_WEB_HTTP_TIMEOUT", 10))
+
+# The number of times a failed connection is retried.
+RETRIES = int(os.environ.get("REFLEX_WEB_HTTP_RETRIES", 2))
+
+# The connection pool limits.
+LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20)
+
+_client: httpx.AsyncClient | None = None
+_loop: asyncio.AbstractEventLoop | None = None
+
+
+def get_client() -> httpx.AsyncClient:
+    """Get the shared client of the running event loop.
+
+    Returns:
+        The client.
+    """
+    global _client, _loop
+    loop = asyncio.get_running_loop()
+    if _client is None or _client.is_closed or _loop is not loop:
+        _client = httpx.AsyncClient(
+            timeout=TIMEOUT,
+            transport=httpx.AsyncHTTPTransport(retries=RETRIES, limits=LIMITS),
+        )
+        _loop = loop
+    return _client
+
+
+async def post(url: str, **kwargs) -> httpx.Response:
+    """Post a request with the shared client.
+
+    Args:
+        url: The url to post to.
+        **kwargs: The arguments of the request, e.g. json or headers.
+
+    Returns:
+        The response.
+
+    Raises:
+        httpx.HTTPError: If the request failed or the response is an error.
+    """
+    response = await get_client().post(url, **kwargs)
+    response.raise_for_status()
+    return response
+
+
+async def close():
+    """Close the shared client and its connections."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+@contextlib.asynccontextmanager
+async def lifespan():
+    """Close the shared client when the backend shuts down."""
+    try:
+        yield
+    finally:
+        await close()
@@ -0,0 +1,136 @@
+"""Lazy route registration for the dev server.
+
+Set REFLEX_WEB_LAZY_ROUTES to register every page as a lightweight placeholder
+when running `reflex run` in dev mode. The first visit to a placeholder adds its
+route to a list persisted in the cache directory and touches the app module,
+which makes the dev server reload and build the real page. The list survives
+restarts, so working on a single doc page only ever builds that page (and the
+index).
+
+This only skips evaluating the component trees of the pages and compiling
+them. The routes are still created when `pcweb.pages` is imported, so the
+import-time work (parsing the docs, the component docs, the API and CLI
+references) runs as usual and is only sped up by the build caches.
+"""
+
+import json
+import os
+from pathlib import Path
+
+import reflex as rx
+from reflex.utils.exec import is_prod_mode
+
+from pcweb.cache import CACHE_DIR
+
+# The file listing the routes that have been visited.
+ROUTES_FILE = CACHE_DIR / "lazy_routes.json"
+
+# Touching this file makes the dev server reload the app.
+APP_MODULE = Path(__file__).with_name("pcweb.py")
+
+# Routes that are always built.
+ALWAYS_BUILT = {""}
+
+
+def is_enabled() -> bool:
+    """Check whether lazy routes are enabled.
+
+    Returns:
+        Whether the placeholders should be registered.
+    """
+    return bool(os.environ.get("REFLEX_WEB_LAZY_ROUTES")) and not is_prod_mode()
+
+
+def normalize(route: str) -> str:
+    """Normalize a route for lookups in the built list."""
+    return route.strip("/")
+
+
+def get_built_routes() -> set[str]:
+    """Get the routes that should be built.
+
+    Returns:
+        The normalized routes that have been visited.
+    """
+    try:
+        routes = json.loads(ROUTES_FILE.read_text())
+    except (OSError, ValueError):
+        routes = []
+    return ALWAYS_BUILT | set(routes)
+
+
+_built_routes: set[str] | None = None
+
+
+def is_built(route: str) -> bool:
+    """Check whether a route should be built rather than registered as a placeholder.
+
+    Args:
+        route: The route of the page.
+
+    Returns:
+        Whether the real page should be built.
+    """
+    global _built_routes
+    if not is_enabled():
+        return True
+    if _built_routes is None:
+        _built_routes = get_built_routes()
+    return normalize(route) in _built_routes
+
+
+def add_built_route(route: str):
+    """Add a route to the built list and have the dev server rebuild the app.
+
+    Args:
+        route: The route of the page.
+    """
+    routes = get_built_routes()
+    if normalize(route) in routes:
+        return
+    routes.add(normalize(route))
+    ROUTES_FILE.parent.mkdir(parents=True, exist_ok=True)
+    ROUTES_FILE.write_text(json.dumps(sorted(routes - ALWAYS_BUILT), indent=2))
+    APP_MODULE.touch()
+
+
+# Only register the state when the placeholders are used.
+if is_enabled():
+
+    class LazyRouteState(rx.State):
+        """The state for the placeholder pages."""
+
+        def build_page(self, route: str):
+            """Build the page for a route on its first visit.
+
+            Args:
+                route: The route of the page.
+            """
+            add_built_route(route)
+
+
+def placeholder(route: str):
+    """Get the placeholder component for a route that has not been built yet.
+
+    Args:
+        route: The route of the page.
+
+    Returns:
+        A function returning the placeholder component.
+    """
+
+    def component() -> rx.Component:
+        return rx.center(
+            rx.vstack(
+                rx.spinner(size="3"),
+                rx.text(f"Building {route} ..."),
+                rx.text(
+                    "The page will show up once the dev server has reloaded.",
+                    class_name="text-slate-9",
+                ),
+                align="center",
+            ),
+            class_name="h-screen w-full",
+        )
+
+    return component
@@ -0,0 +1,222 @@
+"""Build manifest recording what each compiled doc page depends on.
+
+A doc page only skips compilation when the page was compiled after its
+manifest entry was recorded and none of its dependencies changed since.
+Pages that are registered as lazy placeholders are never recorded, since the
+placeholder is compiled in their place.
+"""
+
+import ast
+import functools
+import inspect
+import os
+import re
+import time
+from pathlib import Path
+
+import flexdown
+
+from pcweb import lazy
+from pcweb.cache import get_cache, get_source_version, hash_bytes
+
+# Source files every docpage is built from.
+TEMPLATE_DEPENDENCIES = [
+    "pcweb/flexdown.py",
+    "pcweb/templates/docpage/**/*.py",
+    "pcweb/components/docpage/**/*.py",
+]
+
+# Additional source files for component library pages.
+LIBRARY_DEPENDENCIES = [
+    "pcweb/pages/docs/component.py",
+]
+
+# Matches the code blocks that are executed while building a page.
+CODE_BLOCK_REGEX = re.compile(
+    r"^```python (?:exec|demo)[^\n]*\n(.*?)^```", re.DOTALL | re.MULTILINE
+)
+
+ROOT = Path.cwd()
+
+
+@functools.lru_cache(maxsize=None)
+def file_digest(path: str) -> str:
+    """Get the content hash of a file, or an empty string if it does not exist."""
+    try:
+        return hash_bytes((ROOT / path).read_bytes())
+    except OSError:
+        return ""
+
+
+@functools.lru_cache(maxsize=None)
+def expand(patterns: tuple[str, ...]) -> list[str]:
+    """Expand glob patterns relative to the repo root."""
+    return sorted(
+        str(path.relative_to(ROOT)) for pattern in patterns for path in ROOT.glob(pattern)
+    )
+
+
+def resolve_module(name: str, search_dirs: list[Path]) -> list[str]:
+    """Get the local source files a dotted module name may refer to.
+
+    Args:
+        name: The dotted module name.
+        search_dirs: The directories to resolve the module against.
+
+    Returns:
+        The matching files, relative to the repo root.
+    """
+    parts = name.split(".")
+    files = []
+    for directory in search_dirs:
+        base = directory.joinpath(*parts)
+        for candidate in (base.with_suffix(".py"), base / "__init__.py"):
+            if candidate.is_file():
+                files.append(str(candidate.resolve().relative_to(ROOT)))
+    return files
+
+
+def get_code_imports(doc: str, source: str) -> list[str]:
+    """Get the local modules imported by the exec and demo blocks of a document.
+
+    Args:
+        doc: The path to the document.
+        source: The content of the document.
+
+    Returns:
+        The imported source files, relative to the repo root.
+    """
+    # Exec blocks run with the document's directory on the path.
+    search_dirs = [ROOT, (ROOT / doc).parent]
+    files = []
+    for match in CODE_BLOCK_REGEX.finditer(source):
+        try:
+            tree = ast.parse(match.group(1))
+        except SyntaxError:
+            continue
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                for alias in node.names:
+                    files.extend(resolve_module(alias.name, search_dirs))
+            elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+                files.extend(resolve_module(node.module, search_dirs))
+                # The imported names may be submodules.
+                for alias in node.names:
+                    files.extend(
+                        resolve_module(f"{node.module}.{alias.name}", search_dirs)
+                    )
+    return files
+
+
+def get_dependencies(
+    doc: str, document: flexdown.Document, components: list[type] = ()
+) -> dict[str, str]:
+    """Get the source files a doc page is built from along with their hashes.
+
+    Args:
+        doc: The path to the document.
+        document: The parsed document.
+        components: The component classes documented on the page.
+
+    Returns:
+        A mapping from each dependency to its content hash.
+    """
+    dependencies = [doc, *expand(tuple(TEMPLATE_DEPENDENCIES))]
+    dependencies.extend(get_code_imports(doc, document.content))
+
+    if doc.startswith("docs/library"):
+        dependencies.extend(expand(tuple(LIBRARY_DEPENDENCIES)))
+        dependencies.append(doc.replace(".md", "-ll.md"))
+        for component in components:
+            # Components from installed packages are covered by the manifest version.
+            try:
+                source_file = Path(inspect.getsourcefile(component)).resolve()
+            except TypeError:
+                continue
+            if source_file.is_relative_to(ROOT):
+                dependencies.append(str(source_file.relative_to(ROOT)))
+
+    return {path: file_digest(path) for path in sorted(set(dependencies))}
+
+
+def get_manifest():
+    """Get the build manifest store."""
+    return get_cache(
+        "build_manifest", f"{get_source_version('reflex')}-{get_source_version('flexdown')}"
+    )
+
+
+def is_up_to_date(
+    doc: str, compiled_output: str, dependencies: dict[str, str]
+) -> bool:
+    """Check whether a compiled page is still current.
+
+    Args:
+        doc: The path to the document.
+        compiled_output: The path to the compiled page.
+        dependencies: The current dependencies of the page.
+
+    Returns:
+        Whether the page can skip compilation.
+    """
+    entry = get_manifest().get(doc)
+    if not isinstance(entry, tuple):
+        return False
+    recorded_at, recorded_dependencies = entry
+    if recorded_dependencies != dependencies:
+        return False
+    # The entry is recorded before compiling, so an older output means the compile never finished.
+    output = Path(compiled_output)
+    return output.exists() and output.stat().st_mtime >= recorded_at
+
+
+def record(doc: str, dependencies: dict[str, str]):
+    """Record the dependencies of a page that is about to be compiled.
+
+    Args:
+        doc: The path to the document.
+        dependencies: The dependencies of the page.
+    """
+    get_manifest().set(doc, (time.time(), dependencies))
+
+
+def forget(doc: str):
+    """Remove the entry of a page, so it is compiled the next time it is built.
+
+    Args:
+        doc: The path to the document.
+    """
+    get_manifest().delete(doc)
+
+
+def should_skip_compile(
+    doc: str, route: str, document: flexdown.Document, components=()
+) -> bool:
+    """Skip compilation if the page and everything it is built from are unchanged since the last compilation.
+
+    Args:
+        doc: The path to the document.
+        route: The route of the page.
+        document: The parsed document.
+        components: The component classes documented on the page.
+
+    Returns:
+        Whether the page can skip compilation.
+    """
+    if not os.environ.get("REFLEX_PERSIST_WEB_DIR", False):
+        return False
+
+    # The placeholder is compiled instead of the page, so its output never
+    # counts as the compiled page, even if the page was compiled before.
+    if not lazy.is_built(route):
+        forget(doc)
+        return False
+
+    compiled_output = f".web/pages/{route.strip('/')}.js"
+    dependencies = get_dependencies(doc, document, components)
+    if is_up_to_date(doc, compiled_output, dependencies):
+        return True
+
+    # The page is compiled in this run, so record what it is built from.
+    record(doc, dependencies)
+    return False
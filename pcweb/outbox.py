@@ -0,0 +1,329 @@
+"""A durable outbox for the form submissions posted to webhooks.
+
+Event handlers only insert the submission into the outbox table, and a
+background task of the backend delivers the pending messages in batches,
+retrying failed ones with exponential backoff. Messages store the name of
+their destination, never its url or credentials, which are read from the
+environment at delivery time. Messages to a destination that is not configured
+are not stored at all, and failures that a retry cannot fix (a missing
+configuration or a client error response) are given up on right away.
+
+- REFLEX_WEB_OUTBOX_POLL_SECONDS: how often to look for due messages (default 5).
+- REFLEX_WEB_OUTBOX_BATCH_SIZE: the number of messages delivered at once (default 50).
+- REFLEX_WEB_OUTBOX_MAX_ATTEMPTS: the attempts before a message is given up on (default 8).
+"""
+
+import asyncio
+import contextlib
+import json
+import os
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Optional
+
+import httpx
+import reflex as rx
+import sqlalchemy
+from sqlmodel import Field, select
+
+from pcweb import http_client
+from pcweb.constants import (
+    API_BASE_URL_LOOPS,
+    REFLEX_DEV_WEB_GENERAL_FORM_FEEDBACK_WEBHOOK_URL,
+    REFLEX_DEV_WEB_LANDING_FORM_SALES_CALL_WEBHOOK_URL,
+    REFLEX_DEV_WEB_NEWSLETTER_FORM_WEBHOOK_URL,
+)
+
+# How often to look for due messages, in seconds.
+POLL_SECONDS = float(os.environ.get("REFLEX_WEB_OUTBOX_POLL_SECONDS", 5))
+
+# The number of messages delivered at once.
+BATCH_SIZE = int(os.environ.get("REFLEX_WEB_OUTBOX_BATCH_SIZE", 50))
+
+# The number of attempts before a message is given up on.
+MAX_ATTEMPTS = int(os.environ.get("REFLEX_WEB_OUTBOX_MAX_ATTEMPTS", 8))
+
+# The delay before the first retry, doubled on each further attempt.
+BASE_BACKOFF = timedelta(seconds=10)
+
+# The longest delay between two attempts.
+MAX_BACKOFF = timedelta(hours=1)
+
+# How long a claimed message is held by a worker before others may retry it.
+LEASE = timedelta(minutes=5)
+
+# The client error responses that may succeed when retried.
+RETRYABLE_STATUS_CODES = {408, 429}
+
+
+class NotConfiguredError(Exception):
+    """The url or credentials of a destination are not set."""
+
+
+class OutboxMessage(rx.Model, table=True):
+    """A form submission waiting to be delivered."""
+
+    # The name of the destination in DESTINATIONS.
+    destination: str
+
+    # The JSON payload of the submission.
+    payload: str
+
+    # The number of delivery attempts so far.
+    attempts: int = 0
+
+    # When to attempt the delivery next. Unset once delivered or given up on.
+    next_attempt_at: Optional[datetime] = Field(
+        default_factory=datetime.utcnow, index=True
+    )
+
+    # The error of the last failed attempt.
+    last_error: Optional[str] = None
+
+    date_created: datetime = Field(default_factory=datetime.utcnow, nullable=False)
+    delivered_at: Optional[datetime] = None
+
+
+async def post_newsletter(payload: dict[str, Any]):
+    await http_client.post(REFLEX_DEV_WEB_NEWSLETTER_FORM_WEBHOOK_URL, json=payload)
+
+
+async def post_loops(payload: dict[str, Any]):
+    loops_api_key = os.getenv("LOOPS_API_KEY")
+    if not loops_api_key:
+        raise NotConfiguredError("Loops API key does not exist")
+    await http_client.post(
+        f"{API_BASE_URL_LOOPS}/contacts/create",
+        headers={
+            "Accept": "application/json",
+            "Authorization": f"Bearer {loops_api_key}",
+        },
+        json=payload,
+    )
+
+
+async def post_feedback(payload: dict[str, Any]):
+    if not REFLEX_DEV_WEB_GENERAL_FORM_FEEDBACK_WEBHOOK_URL:
+        raise NotConfiguredError("The feedback webhook url is not set")
+    await http_client.post(
+        REFLEX_DEV_WEB_GENERAL_FORM_FEEDBACK_WEBHOOK_URL, json=payload
+    )
+
+
+async def post_sales(payload: dict[str, Any]):
+    await http_client.post(
+        REFLEX_DEV_WEB_LANDING_FORM_SALES_CALL_WEBHOOK_URL, json=payload
+    )
+
+
+# The destinations of the outbox messages, by name.
+DESTINATIONS: dict[str, Callable[[dict[str, Any]], Awaitable[None]]] = {
+    "newsletter": post_newsletter,
+    "loops": post_loops,
+    "feedback": post_feedback,
+    "sales": post_sales,
+}
+
+# Set when messages are added, to deliver them without waiting for the next poll.
+_wakeup: asyncio.Event | None = None
+
+
+def is_configured(destination: str) -> bool:
+    """Check whether the url and credentials of a destination are set.
+
+    Args:
+        destination: The name of the destination.
+
+    Returns:
+        Whether messages to the destination can be delivered.
+    """
+    if destination == "loops":
+        return bool(os.getenv("LOOPS_API_KEY"))
+    if destination == "feedback":
+        return bool(REFLEX_DEV_WEB_GENERAL_FORM_FEEDBACK_WEBHOOK_URL)
+    return True
+
+
+def enqueue(*messages: tuple[str, dict[str, Any]]):
+    """Add messages to the outbox.
+
+    Messages to destinations that are not configured are dropped.
+
+    Args:
+        *messages: The destination name and payload of each message.
+
+    Raises:
+        ValueError: If a destination is unknown.
+    """
+    for destination, _ in messages:
+        if destination not in DESTINATIONS:
+            raise ValueError(f"Unknown outbox destination {destination}")
+    messages = tuple(
+        (destination, payload)
+        for destination, payload in messages
+        if is_configured(destination)
+    )
+    if not messages:
+        return
+
+    with rx.session() as session:
+        for destination, payload in messages:
+            session.add(
+                OutboxMessage(destination=destination, payload=json.dumps(payload))
+            )
+        session.commit()
+    if _wakeup is not None:
+        _wakeup.set()
+
+
+def get_backoff(attempts: int) -> timedelta:
+    """Get the delay before the next attempt.
+
+    Args:
+        attempts: The number of failed attempts so far.
+
+    Returns:
+        The delay.
+    """
+    return min(BASE_BACKOFF * 2 ** min(attempts - 1, 32), MAX_BACKOFF)
+
+
+def claim_due_messages(now: datetime) -> list[OutboxMessage]:
+    """Claim a batch of the messages due for delivery.
+
+    Claimed messages are leased, so the workers of other backend processes skip
+    them until the lease expires.
+
+    Args:
+        now: The current time.
+
+    Returns:
+        The claimed messages.
+    """
+    claimed = []
+    with rx.session() as session:
+        messages = session.exec(
+            select(OutboxMessage)
+            .where(OutboxMessage.next_attempt_at <= now)
+            .order_by(OutboxMessage.next_attempt_at)
+            .limit(BATCH_SIZE)
+        ).all()
+        for message in messages:
+            result = session.execute(
+                sqlalchemy.update(OutboxMessage)
+                .where(
+                    OutboxMessage.id == message.id,
+                    OutboxMessage.next_attempt_at == message.next_attempt_at,
+                )
+                .values(next_attempt_at=now + LEASE)
+            )
+            if result.rowcount:
+                claimed.append(message)
+        # Keep the loaded messages usable once the session is closed.
+        session.expunge_all()
+        session.commit()
+    return claimed
+
+
+def is_permanent(error: BaseException) -> bool:
+    """Check whether a failed delivery would fail again when retried.
+
+    Args:
+        error: The error of the delivery.
+
+    Returns:
+        Whether the message should be given up on.
+    """
+    if isinstance(error, NotConfiguredError):
+        return True
+    if isinstance(error, httpx.HTTPStatusError):
+        status = error.response.status_code
+        return 400 <= status < 500 and status not in RETRYABLE_STATUS_CODES
+    return False
+
+
+def get_outcome(message: OutboxMessage, error: BaseException | None) -> dict[str, Any]:
+    """Get the updated columns of a message after a delivery attempt.
+
+    Args:
+        message: The message.
+        error: The error of the attempt, if it failed.
+
+    Returns:
+        The columns to update.
+    """
+    now = datetime.utcnow()
+    attempts = message.attempts + 1
+    if error is None:
+        return dict(
+            attempts=attempts, next_attempt_at=None, delivered_at=now, last_error=None
+        )
+    if attempts >= MAX_ATTEMPTS or is_permanent(error):
+        print(
+            f"Giving up on outbox message {message.id} to {message.destination} "
+            f"after {attempts} attempts: {error}"
+        )
+        next_attempt_at = None
+    else:
+        next_attempt_at = now + get_backoff(attempts)
+    return dict(
+        attempts=attempts, next_attempt_at=next_attempt_at, last_error=str(error)
+    )
+
+
+def record_outcomes(messages: list[OutboxMessage], results: list[Any]):
+    """Store the outcome of the delivery attempts.
+
+    Args:
+        messages: The attempted messages.
+        results: The result of each attempt, an exception if it failed.
+    """
+    with rx.session() as session:
+        for message, result in zip(messages, results):
+            error = result if isinstance(result, BaseException) else None
+            session.execute(
+                sqlalchemy.update(OutboxMessage)
+                .where(OutboxMessage.id == message.id)
+                .values(**get_outcome(message, error))
+            )
+        session.commit()
+
+
+async def deliver_due_messages() -> int:
+    """Deliver a batch of the messages due for delivery.
+
+    The database is accessed in a worker thread, so the event loop is never
+    blocked by it.
+
+    Returns:
+        The number of messages attempted.
+    """
+    messages = await asyncio.to_thread(claim_due_messages, datetime.utcnow())
+    if not messages:
+        return 0
+
+    results = await asyncio.gather(
+        *(
+            DESTINATIONS[message.destination](json.loads(message.payload))
+            for message in messages
+        ),
+        return_exceptions=True,
+    )
+    await asyncio.to_thread(record_outcomes, messages, results)
+    return len(messages)
+
+
+async def worker():
+    """Deliver the outbox messages for as long as the backend runs."""
+    global _wakeup
+    _wakeup = asyncio.Event()
+    while True:
+        _wakeup.clear()
+        try:
+            attempted = await deliver_due_messages()
+        except Exception as e:
+            print(f"Failed to deliver the outbox messages: {e}")
+            attempted = 0
+        # Keep going while there is a backlog, otherwise wait for new messages.
+        if attempted < BATCH_SIZE:
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(_wakeup.wait(), POLL_SECONDS)
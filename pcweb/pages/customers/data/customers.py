@@ -1,5 +1,5 @@
 import reflex as rx
-import flexdown
+from pcweb.content import load_collection
 from pcweb.flexdown import xd2 as xd
 from pcweb.templates.storypage import storypage
 
@@ -12,22 +12,12 @@ def content(document):
 
 CUSTOMERS_PATH = "case-studies/"
 
-def get_customer_data(paths):
-    customers = {}
-    for path in reversed(sorted(paths)):
-        document = flexdown.parse_file(path)
-        path = path.replace(".md", "/")
-        customers[path] = document
-    return customers
-
-
 def get_route(path: str):
     """Get the route for a page."""
     return path.replace(CUSTOMERS_PATH, "").replace(".md", "")
 
 
-paths = flexdown.utils.get_flexdown_files(CUSTOMERS_PATH)
-customer_data = get_customer_data(paths)
+customer_data = load_collection(CUSTOMERS_PATH)
 
 customers_routes = []
 for path, document in customer_data.items():
@@ -1,4 +1,5 @@
 import os
+import re
 from collections import defaultdict
 from types import SimpleNamespace
 
@@ -9,11 +10,18 @@ import flexdown
 from reflex_ag_grid import ag_grid
 from reflex_pyplot import pyplot
 
-from pcweb.flexdown import xd
+from pcweb.cache import parse_file
+from pcweb.flexdown import get_exec_key, is_code_block, xd
+from pcweb import manifest, profiling
 from pcweb.pages.docs.component import multi_docs
 from pcweb.route import Route
-from pcweb.templates.docpage import docpage, get_toc
-from pcweb.whitelist import _check_whitelisted_path
+from pcweb.templates.docpage import docpage
+from pcweb.whitelist import (
+    _check_whitelisted_path,
+    add_whitelisted_paths,
+    has_whitelist,
+    is_excluded,
+)
 from reflex.components.radix.primitives.base import RadixPrimitiveComponent
 from reflex.components.radix.themes.base import RadixThemesComponent
 
@@ -25,22 +33,6 @@ from .cloud_cliref import pages as cloud_cliref_pages
 from pcweb.pages.library_previews import components_previews_pages
 
 
-def should_skip_compile(doc: flexdown.Document):
-    """Skip compilation if the markdown file has not been modified since the last compilation."""
-    if not os.environ.get("REFLEX_PERSIST_WEB_DIR", False):
-        return False
-
-    # Check if the doc has been compiled already.
-    compiled_output = f".web/pages/{doc.replace('.md', '.js')}"
-    # Get the timestamp of the compiled file.
-    compiled_time = (
-        os.path.getmtime(compiled_output) if os.path.exists(compiled_output) else 0
-    )
-    # Get the timestamp of the source file.
-    source_time = os.path.getmtime(doc)
-    return compiled_time > source_time
-
-
 def to_title_case(text: str) -> str:
     return " ".join(word.capitalize() for word in text.split("_"))
 
@@ -91,9 +83,10 @@ def get_components_from_metadata(current_doc):
     return components
 
 
-flexdown_docs = [
-    doc.replace("\\", "/") for doc in flexdown.utils.get_flexdown_files("docs/")
-]
+with profiling.phase("discover"):
+    flexdown_docs = [
+        doc.replace("\\", "/") for doc in flexdown.utils.get_flexdown_files("docs/")
+    ]
 
 graphing_components = defaultdict(list)
 component_list = defaultdict(list)
@@ -108,15 +101,63 @@ def exec_blocks(doc, href):
     env["__xd"] = xd
     env["__exec"] = True
     blocks = xd.get_blocks(source, href)
-    # Get only the exec and demo blocks.
-    blocks = [b for b in blocks if b.__class__.__name__ in ["ExecBlock", "DemoBlock"]]
-    for block in blocks:
-        block.render(env)
+    # Get only the blocks that run code.
+    blocks = [b for b in blocks if is_code_block(b)]
+    required = xd.get_required_code_blocks(blocks, doc.filename)
+    for i, block in enumerate(required):
+        xd.render_block(block, env, get_exec_key(doc.filename, i, block))
 
 
 outblocks = []
 
 
+# Matches the `{namespace.page.path}` links between docs.
+LINK_REGEX = re.compile(r"\{\s*([A-Za-z_][\w.]*)\.path\s*\}")
+
+
+def get_linked_routes(
+    docs: list[str], routes: dict[str, str], route_docs: dict[str, str]
+) -> set[str]:
+    """Get the routes the given docs link to through the docs namespaces, transitively.
+
+    The linked docs are followed in turn until no new pages are found, so
+    every page reachable from the given docs is included. Excluded pages are
+    not followed.
+
+    Args:
+        docs: The paths to the docs.
+        routes: The route of each page, keyed by its dotted namespace path.
+        route_docs: The path to the doc of each route.
+
+    Returns:
+        The linked routes.
+    """
+    linked = set()
+    seen = set(docs)
+    pending = list(docs)
+    while pending:
+        doc = pending.pop()
+        with open(doc, encoding="utf-8") as file:
+            source = file.read()
+        for match in LINK_REGEX.finditer(source):
+            # Links may go through any parent namespace, e.g. `docs.` or none.
+            parts = match.group(1).split(".")
+            for i in range(len(parts)):
+                route = routes.get(".".join(parts[i:]))
+                if route is not None:
+                    break
+            else:
+                continue
+            if route in linked or is_excluded(route):
+                continue
+            linked.add(route)
+            linked_doc = route_docs.get(route)
+            if linked_doc is not None and linked_doc not in seen:
+                seen.add(linked_doc)
+                pending.append(linked_doc)
+    return linked
+
+
 manual_titles = {
     "docs/database/overview.md": "Database Overview",
     "docs/custom-components/overview.md": "Custom Components Overview",
@@ -154,15 +195,17 @@ def get_component(doc: str, title: str):
     if not _check_whitelisted_path(route):
         return
 
-    d = flexdown.parse_file(doc)
+    with profiling.phase("parse", doc):
+        d = parse_file(doc)
 
     if doc.startswith("docs/library/graphing"):
-        if should_skip_compile(doc):
+        clist = [title, *get_components_from_metadata(d)]
+        if manifest.should_skip_compile(doc, route, d, [c for c, _ in clist[1:]]):
             outblocks.append((d, route))
             return
-        clist = [title, *get_components_from_metadata(d)]
         graphing_components[category].append(clist)
-        return multi_docs(path=route, comp=d, component_list=clist, title=title2)
+        with profiling.phase("multi_docs", doc):
+            return multi_docs(path=route, comp=d, component_list=clist, title=title2)
     if doc.startswith("docs/library"):
         clist = [title, *get_components_from_metadata(d)]
         if len(clist) > 1:
@@ -173,17 +216,18 @@ def get_component(doc: str, title: str):
                 component_list[category].append(clist)
             else:
                 component_list[category].append(clist)
-        if should_skip_compile(doc):
+        if manifest.should_skip_compile(doc, route, d, [c for c, _ in clist[1:]]):
             outblocks.append((d, route))
             return
-        return multi_docs(path=route, comp=d, component_list=clist, title=title2)
+        with profiling.phase("multi_docs", doc):
+            return multi_docs(path=route, comp=d, component_list=clist, title=title2)
 
-    if should_skip_compile(doc):
+    if manifest.should_skip_compile(doc, route, d):
         outblocks.append((d, route))
         return
 
     return docpage(set_path=route, t=title2)(
-        lambda d=d, doc=doc: (get_toc(d, doc), xd.render(d, doc))
+        lambda d=d, doc=doc: xd.render_with_toc(d, doc)
     )
 
 
@@ -207,6 +251,28 @@ for api_route in cloud_cliref_pages:
     title = rx.utils.format.to_snake_case(api_route.title)
     build_nested_namespace(docs_ns, ["api_reference"], title, api_route)
 
+# Build the pages that whitelisted docs link to as well. Without a whitelist,
+# every page that is not excluded is built anyway.
+if has_whitelist():
+    namespace_routes = {
+        "api_reference." + rx.utils.format.to_snake_case(api_route.title): api_route.path
+        for api_route in apiref_pages + cloud_cliref_pages
+    }
+    route_docs = {}
+    for doc in flexdown_docs:
+        namespace = [rx.utils.format.to_snake_case(part) for part in doc.split("/")[1:-1]]
+        title = rx.utils.format.to_snake_case(os.path.basename(doc).replace(".md", ""))
+        route = rx.utils.format.to_kebab_case(f"/{doc.replace('.md', '/')}")
+        namespace_routes[".".join([*namespace, title])] = route
+        route_docs[route] = doc
+    add_whitelisted_paths(
+        get_linked_routes(
+            [doc for route, doc in route_docs.items() if _check_whitelisted_path(route)],
+            namespace_routes,
+            route_docs,
+        )
+    )
+
 for doc in sorted(flexdown_docs):
     path = doc.split("/")[1:-1]
 
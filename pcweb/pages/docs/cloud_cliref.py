@@ -1,55 +1,56 @@
-import subprocess
-import tempfile
-import os
+import importlib
 import re
-from pcweb.templates.docpage import docpage
-import reflex as rx
-
-def get_command_help_output(path_to_file: str = None, name_of_cli_program: str = "reflex") -> str:
-    # Create a temporary file
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".md") as temp_file:
-        temp_file_path = temp_file.name
-
-    try:
-        # Run the command and save the output to the temporary file
-        result = subprocess.run(
-            [
-                "typer", path_to_file, "utils", "docs",
-                "--name", name_of_cli_program, "--output", temp_file_path
-            ],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True
-        )
 
-        # Check if the command ran successfully
-        if result.returncode != 0:
-            print("Error running command:", result.stderr)
-            return None
+import click
+import typer
+import typer.cli
+import typer.main
 
-        # Read the content from the temporary file
-        with open(temp_file_path, 'r') as file:
-            output = file.read()
+from pcweb.cache import MISSING, get_cache, get_source_version
+from pcweb.templates.docpage import docpage
+import reflex as rx
 
-    finally:
-        # Clean up and delete the temporary file
-        if os.path.exists(temp_file_path):
-            os.remove(temp_file_path)
 
-    # Return the content of the temporary file
-    return output
+def get_cli_command(module_name: str) -> click.Command:
+    """Get the CLI defined in a module, the way `typer <module> utils docs` finds it.
+
+    Args:
+        module_name: The dotted name of the module.
+
+    Returns:
+        The click command of the CLI.
+    """
+    module = importlib.import_module(module_name)
+    objects = sorted(vars(module).items(), key=lambda item: item[0] not in ("app", "cli", "main"))
+    for _, obj in objects:
+        if isinstance(obj, typer.Typer):
+            return typer.main.get_command(obj)
+    # Newer reflex_cli versions define plain click groups.
+    for _, obj in objects:
+        if isinstance(obj, click.Group):
+            return obj
+    raise ValueError(f"No CLI found in {module_name}")
+
+
+def get_command_help_output(path_to_file: str, name_of_cli_program: str = "reflex") -> str:
+    """Get the markdown docs of a CLI, in process.
+
+    Args:
+        path_to_file: The dotted name of the module defining the CLI.
+        name_of_cli_program: The name to document the CLI under.
+
+    Returns:
+        The docs of the CLI and all its subcommands.
+    """
+    command = get_cli_command(path_to_file)
+    return typer.cli.get_docs_for_click(
+        obj=command, ctx=click.Context(command), name=name_of_cli_program
+    )
 
-# Dictionary to store the parsed documentation
-docs_dict = {}
 
 def process_command(prefix, path_to_file, dict_prefix=""):
     # Get the help output
-    if " " in prefix:
-        output = get_command_help_output(
-            path_to_file=path_to_file, name_of_cli_program=prefix
-        )
-    else:
-        output = get_command_help_output(path_to_file=path_to_file)
+    output = get_command_help_output(path_to_file=path_to_file, name_of_cli_program=prefix)
 
     # Construct the regular expression pattern
     escaped_prefix = re.escape(prefix)
@@ -76,9 +77,23 @@ commands_info = [
     ("reflex", "reflex.reflex", ""),
 ]
 
-# Iterate over each command configuration
-for prefix, path_to_file, dict_prefix in commands_info:
-    process_command(prefix, path_to_file, dict_prefix)
+# The docs only change with the CLIs and the doc generator.
+cli_cache = get_cache(
+    "cli_reference",
+    "-".join(
+        get_source_version(package)
+        for package in ("reflex", "reflex-hosting-cli", "typer")
+    ),
+)
+
+# Dictionary to store the parsed documentation
+docs_dict = cli_cache.get("docs")
+if docs_dict is MISSING:
+    docs_dict = {}
+    # Iterate over each command configuration
+    for prefix, path_to_file, dict_prefix in commands_info:
+        process_command(prefix, path_to_file, dict_prefix)
+    cli_cache.set("docs", docs_dict)
 
 
 # Dictionary to store the categories and their respective commands
@@ -1,10 +1,14 @@
 """Utility functions for the component docs page."""
 
+import ast
+import functools
 import inspect
 import os
 import re
+from pathlib import Path
 from typing import (
     Any,
+    Sequence,
     Type,
     get_args,
     Literal,
@@ -15,15 +19,17 @@ from typing import (
 )
 from pydantic import Field
 import reflex as rx
-import flexdown
 import textwrap
+from pcweb.api_reference import get_bundle, get_key
+from pcweb.cache import MISSING, get_cache, get_source_version, hash_bytes, parse_file
 from pcweb.flexdown import markdown, xd
-from pcweb.templates.docpage import docpage, get_toc, h1_comp, h2_comp, docdemobox
+from pcweb.templates.docpage import docpage, get_api_reference_toc, h1_comp, h2_comp, docdemobox
 from reflex.base import Base
 from reflex.components.component import Component
 from reflex.components.radix.primitives.base import RadixPrimitiveComponent
 from reflex.components.radix.themes.base import RadixThemesComponent
 from reflex.components.base.fragment import Fragment
+from reflex.utils import console
 
 
 def get_code_style(color: str):
@@ -55,48 +61,19 @@ from reflex.components.el.elements.base import BaseHTML
 import re
 
 
-def get_default_value(lines: list[str], start_index: int) -> str:
-    """Process lines of code to get the value of a prop, handling multi-line values.
+def clean_default_value(value: str) -> str:
+    """Format the source of a prop default for the docs.
 
     Args:
-        lines: The lines of code to process.
-        start_index: The index of the line where the prop is defined.
+        value: The source of the default value.
 
     Returns:
-        The default value of the prop.
+        The default value on a single line.
     """
-    # Check for the default value in the prop comment (Default: )
-    # Need to update the components comments in order to get the default value
-    if start_index > 0:
-        comment_line = lines[start_index - 1].strip()
-        if comment_line.startswith("#"):
-            default_match = re.search(r"Default:\s*(.+)$", comment_line)
-            if default_match:
-                default_value = default_match.group(1).strip()
-                return default_value
-
-    # Get the initial line
-    line = lines[start_index]
-    parts = line.split("=", 1)
-    if len(parts) != 2:
-        return ""
-    value = parts[1].strip()
-
-    # Check if the value is complete
-    open_brackets = value.count("{") - value.count("}")
-    open_parentheses = value.count("(") - value.count(")")
-
-    # If brackets or parentheses are not balanced, collect more lines
-    current_index = start_index + 1
-    while (open_brackets > 0 or open_parentheses > 0) and current_index < len(lines):
-        next_line = lines[current_index].strip()
-        value += " " + next_line
-        open_brackets += next_line.count("{") - next_line.count("}")
-        open_parentheses += next_line.count("(") - next_line.count(")")
-        current_index += 1
-
-    # Remove any trailing comments
-    value = re.split(r"\s+#", value)[0].strip()
+    # Remove the comments and join the lines.
+    value = " ".join(
+        re.split(r"\s+#|^#", line.strip())[0].strip() for line in value.splitlines()
+    ).strip()
 
     # Process Var.create_safe within dictionary
     def process_var_create_safe(match):
@@ -111,26 +88,92 @@ def get_default_value(lines: list[str], start_index: int) -> str:
     return value.strip()
 
 
+class PropSource(Base):
+    """The source of a prop in its class body."""
+
+    # The name of the prop.
+    name: str
+
+    # The comment lines above the prop.
+    comments: list[str]
+
+    # The source of the default value, if any.
+    default_value: str
+
+
+def get_class_props(source: str, cls: ast.ClassDef) -> list[PropSource]:
+    """Get the annotated attributes of a class body along with their comments.
+
+    Args:
+        source: The source of the module.
+        cls: The class definition.
+
+    Returns:
+        The attributes in the order they are defined.
+    """
+    lines = source.splitlines()
+    out = []
+    previous_end = cls.lineno
+    for node in cls.body:
+        if isinstance(node, ast.AnnAssign) and isinstance(node.target, ast.Name):
+            # The comments between the previous statement and this one.
+            comments = [
+                line
+                for line in lines[previous_end : node.lineno - 1]
+                if line.strip().startswith("#")
+            ]
+            default_value = ""
+            if comments:
+                default_match = re.search(r"Default:\s*(.+)$", comments[-1].strip())
+                if default_match:
+                    default_value = default_match.group(1).strip()
+            if not default_value and node.value is not None:
+                default_value = clean_default_value(
+                    ast.get_source_segment(source, node.value) or ""
+                )
+            out.append(
+                PropSource(
+                    name=node.target.id,
+                    comments=comments,
+                    default_value=default_value,
+                )
+            )
+        previous_end = node.end_lineno
+    return out
+
+
+@functools.cache
+def get_module_props(path: str) -> dict[str, list[PropSource]]:
+    """Get the annotated attributes of every class in a source file.
+
+    The file is parsed once per build, and shared by all the components it defines.
+
+    Args:
+        path: The path to the source file.
+
+    Returns:
+        The attributes of each class, keyed by qualified name.
+    """
+    with open(path, encoding="utf-8") as file:
+        source = file.read()
+
+    out = {}
+    pending = [("", node) for node in ast.parse(source).body]
+    while pending:
+        prefix, node = pending.pop()
+        if isinstance(node, ast.ClassDef):
+            qualname = prefix + node.name
+            out[qualname] = get_class_props(source, node)
+            pending.extend((qualname + ".", child) for child in node.body)
+    return out
+
+
 class Source(Base):
     """Parse the source code of a component."""
 
     # The component to parse.
     component: Type[Component]
 
-    # The source code.
-    code: list[str] = []
-
-    def __init__(self, *args, **kwargs):
-        """Initialize the source code parser."""
-        super().__init__(*args, **kwargs)
-
-        # Get the source code.
-        self.code = [
-            line
-            for line in inspect.getsource(self.component).splitlines()
-            if len(line) > 0
-        ]
-
     def get_docs(self) -> str:
         """Get the docstring of the component.
 
@@ -145,19 +188,7 @@ class Source(Base):
         Returns:
             A dictionary of the props and their descriptions.
         """
-        props = self._get_props()
-
-        parent_cls = self.component.__bases__[0]
-        if parent_cls != rx.Component and parent_cls != BaseHTML:
-            parent_props = Source(component=parent_cls).get_props()
-            # filter out the props that have been overridden in the parent class.
-            props += [
-                prop
-                for prop in parent_props
-                if prop.name not in {p.name for p in props}
-            ]
-
-        return props
+        return list(get_component_props(self.component))
 
     def _get_props(self) -> list[Prop]:
         """Get a dictionary of the props and their descriptions.
@@ -165,55 +196,82 @@ class Source(Base):
         Returns:
             A dictionary of the props and their descriptions.
         """
-        out = []
-        props = self.component.get_props()
-        comments = []
+        try:
+            path = inspect.getsourcefile(self.component)
+        except TypeError:
+            return []
+        if path is None:
+            return []
 
-        for i, line in enumerate(self.code):
-            line = self.code[i]
+        props = self.component.get_props()
+        fields = self.component.get_fields()
+        return [
+            Prop(
+                name=prop.name,
+                type_=fields[prop.name].outer_type_,
+                default_value=prop.default_value,
+                description=Source.get_comment(prop.comments),
+            )
+            for prop in get_module_props(path).get(self.component.__qualname__, [])
+            if prop.name in props
+        ]
 
-            if re.search("def ", line):
-                break
+    @staticmethod
+    def get_comment(comments: list[str]):
+        return "".join([comment.strip().strip("#") for comment in comments])
 
-            if line.strip().startswith("#"):
-                comments.append(line)
-                continue
 
-            match = re.search(r"\w+:", line)
-            if match is None:
-                continue
+def introspect_props(component: Type[Component]) -> list[dict[str, str]]:
+    """Read the documented props of a component, including the inherited ones, from its source.
 
-            prop = match.group(0).strip(":")
-            if prop not in props:
-                continue
+    Args:
+        component: The component class.
 
-            default_value = get_default_value(self.code, i)
+    Returns:
+        The name, description and default value of each prop.
+    """
+    props = Source(component=component)._get_props()
+
+    parent_cls = component.__bases__[0]
+    if parent_cls != rx.Component and parent_cls != BaseHTML:
+        # filter out the props that have been overridden in the parent class.
+        names = {prop.name for prop in props}
+        props += [
+            prop for prop in get_component_props(parent_cls) if prop.name not in names
+        ]
 
-            if i > 0:
-                comment_above = self.code[i - 1].strip()
-                assert comment_above.startswith(
-                    "#"
-                ), f"Expected comment, got {comment_above}"
+    return [
+        dict(
+            name=prop.name,
+            description=prop.description,
+            default_value=prop.default_value,
+        )
+        for prop in props
+    ]
 
-            comment = Source.get_comment(comments)
-            comments.clear()
 
-            type_ = self.component.get_fields()[prop].outer_type_
+@functools.cache
+def get_component_props(component: Type[Component]) -> tuple[Prop, ...]:
+    """Get the documented props of a component, including the inherited ones.
 
-            out.append(
-                Prop(
-                    name=prop,
-                    type_=type_,
-                    default_value=default_value,
-                    description=comment,
-                )
-            )
+    Computed once per class, so base classes shared by many components are
+    only parsed once per build, and stored in the API reference bundle, so a
+    warm start parses none.
 
-        return out
+    Args:
+        component: The component class.
 
-    @staticmethod
-    def get_comment(comments: list[str]):
-        return "".join([comment.strip().strip("#") for comment in comments])
+    Returns:
+        The props of the component.
+    """
+    fields = component.get_fields()
+    props = get_bundle().get("props", component, lambda: introspect_props(component))
+    # Skip the props the component no longer has.
+    return tuple(
+        Prop(type_=fields[prop["name"]].outer_type_, **prop)
+        for prop in props
+        if prop["name"] in fields
+    )
 
 
 # Mapping from types to colors.
@@ -232,22 +290,57 @@ TYPE_COLORS = {
     "Union": "gray",
 }
 
-count = 0
+class PropDocsState(rx.State):
+    """The values picked in the interactive prop tables.
+
+    The values are keyed by component and prop, and only hold the props a
+    reader changed, so the state stays small however many props are documented.
+    """
 
-import hashlib
+    # The values of the boolean props.
+    bool_props: dict[str, bool] = {}
 
+    # The values of the literal props.
+    literal_props: dict[str, str] = {}
 
-def get_id(s):
-    global count
-    count += 1
-    s = str(count)
-    hash_object = hashlib.sha256(s.encode())
-    hex_dig = hash_object.hexdigest()
-    return "a_" + hex_dig[:8]
+    def set_bool_prop(self, key: str, value: bool):
+        """Set the value of a boolean prop.
 
+        Args:
+            key: The component and prop.
+            value: The new value.
+        """
+        self.bool_props[key] = value
 
-class PropDocsState(rx.State):
-    """Container for dynamic vars used by the prop docs."""
+    def set_literal_prop(self, key: str, value: str):
+        """Set the value of a literal prop.
+
+        Args:
+            key: The component and prop.
+            value: The new value.
+        """
+        self.literal_props[key] = value
+
+
+def get_prop_key(component, prop) -> str:
+    """Get the key of a prop in the PropDocsState values."""
+    return f"{component.__qualname__}.{prop.name}"
+
+
+def get_bool_prop_var(key: str) -> rx.Var:
+    """Get the current value of a boolean prop, False until it is set."""
+    return rx.cond(
+        PropDocsState.bool_props.contains(key), PropDocsState.bool_props[key], False
+    ).to(bool)
+
+
+def get_literal_prop_var(key: str, default: str) -> rx.Var:
+    """Get the current value of a literal prop, the default until it is set."""
+    return rx.cond(
+        PropDocsState.literal_props.contains(key),
+        PropDocsState.literal_props[key],
+        default,
+    ).to(str)
 
 
 EXCLUDED_COMPONENTS = [
@@ -283,14 +376,12 @@ def render_select(prop, component, prop_dict):
             "default_open",
             "default_checked",
         ]:
-            name = get_id(f"{component.__qualname__}_{prop.name}")
-            PropDocsState.add_var(name, bool, False)
-            var = getattr(PropDocsState, name)
-            setter = getattr(PropDocsState, f"set_{name}")
+            key = get_prop_key(component, prop)
+            var = get_bool_prop_var(key)
             prop_dict[prop.name] = var
             return rx.checkbox(
                 var,
-                on_change=setter,
+                on_change=lambda value: PropDocsState.set_bool_prop(key, value),
             )
     except TypeError:
         pass
@@ -314,10 +405,8 @@ def render_select(prop, component, prop_dict):
                 for lit_arg in arg.__args__
             ]
             option = literal_values[0]
-            name = get_id(f"{component.__qualname__}_{prop.name}")
-            PropDocsState.add_var(name, str, option)
-            var = getattr(PropDocsState, name)
-            setter = getattr(PropDocsState, f"set_{name}")
+            key = get_prop_key(component, prop)
+            var = get_literal_prop_var(key, option)
             prop_dict[prop.name] = var
             return rx.select.root(
                 rx.select.trigger(class_name="w-32 font-small text-slate-11"),
@@ -330,14 +419,12 @@ def render_select(prop, component, prop_dict):
                     )
                 ),
                 value=var,
-                on_change=setter,
+                on_change=lambda value: PropDocsState.set_literal_prop(key, value),
             )
     # Get the first option.
     option = type_.__args__[0]
-    name = get_id(f"{component.__qualname__}_{prop.name}")
-    PropDocsState.add_var(name, str, option)
-    var = getattr(PropDocsState, name)
-    setter = getattr(PropDocsState, f"set_{name}")
+    key = get_prop_key(component, prop)
+    var = get_literal_prop_var(key, option)
     prop_dict[prop.name] = var
 
     if prop.name == "color_scheme":
@@ -367,7 +454,7 @@ def render_select(prop, component, prop_dict):
                                 class_name="text-gray-12 absolute top-1/2 left-1/2 translate-x-[-50%] translate-y-[-50%]",
                             ),
                             bg=f"var(--{color}-9)",
-                            on_click=PropDocsState.setvar(f"{name}", color),
+                            on_click=PropDocsState.set_literal_prop(key, color),
                             border=rx.cond(
                                 var == color, "2px solid var(--gray-12)", ""
                             ),
@@ -400,7 +487,7 @@ def render_select(prop, component, prop_dict):
             ),
         ),
         value=var,
-        on_change=setter,
+        on_change=lambda value: PropDocsState.set_literal_prop(key, value),
     )
 
 
@@ -842,8 +929,67 @@ EVENTS = {
 from reflex.components.radix import themes as rdxt
 
 
+# The digest of the code that builds the previews.
+PREVIEW_CODE_DIGEST = hash_bytes(Path(__file__).read_bytes())[:16]
+
+
+def get_preview_failures():
+    """Get the store of the previews that failed to build.
+
+    It is dropped when reflex or the code that builds the previews changes, so
+    a fix on either side retries the failed previews.
+    """
+    return get_cache(
+        "preview_failures", f"{get_source_version('reflex')}-{PREVIEW_CODE_DIGEST}"
+    )
+
+
+def create_preview(component, doc, prop_dict, is_interactive) -> Component:
+    """Build the live preview of a component for its props table.
+
+    Previews that failed to build are recorded so they are not attempted
+    again. Some components can only be built inside specific parents, so
+    failures are expected and only reported at debug level.
+
+    Args:
+        component: The component class.
+        doc: The flexdown document of the component page.
+        prop_dict: The interactive prop values.
+        is_interactive: Whether the component gets an interactive preview.
+
+    Returns:
+        The preview, or a fragment if there is none.
+    """
+    expression = doc.metadata.get(component.__name__)
+    if expression is None and not is_interactive:
+        return rx.fragment()
+
+    key = get_key(component)
+    digest = hash_bytes(
+        repr((expression, sorted((k, str(v)) for k, v in prop_dict.items()))).encode()
+    )
+    failures = get_preview_failures()
+    if failures.get(key, digest) is not MISSING:
+        return rx.fragment()
+
+    try:
+        if expression is not None:
+            preview = eval(expression)(**prop_dict)
+        elif "data" in component.__name__.lower():
+            raise Exception("Data components cannot be created")
+        else:
+            preview = rx.vstack(component.create("Test", **prop_dict))
+    except Exception as e:
+        console.debug(f"No preview for {component.__name__}: {e}")
+        failures.set(key, str(e), digest)
+        return rx.fragment()
+
+    return preview
+
+
 def generate_props(src, component, comp):
-    if len(src.get_props()) == 0:
+    props = src.get_props()
+    if len(props) == 0:
         return rx.box(
             rx.heading("Props", as_="h3", class_name="font-large text-slate-12"),
             rx.text("No component specific props", class_name="text-slate-9 font-base"),
@@ -876,29 +1022,13 @@ def generate_props(src, component, comp):
             rx.table.row(
                 *prop_docs(prop, prop_dict, component, is_interactive), align="center"
             )
-            for prop in src.get_props()
+            for prop in props
             if not prop.name.startswith("on_")  # ignore event trigger props
         ],
         class_name="bg-slate-2",
     )
 
-    try:
-        if f"{component.__name__}" in comp.metadata:
-            comp = eval(comp.metadata[component.__name__])(**prop_dict)
-
-        elif not is_interactive:
-            comp = rx.fragment()
-
-        else:
-            try:
-                comp = rx.vstack(component.create("Test", **prop_dict))
-            except:
-                comp = rx.fragment()
-            if "data" in component.__name__.lower():
-                raise Exception("Data components cannot be created")
-    except Exception as e:
-        print(f"Failed to create component {component.__name__}, error: {e}")
-        comp = rx.fragment()
+    comp = create_preview(component, comp, prop_dict, is_interactive)
 
     interactive_component = (
         docdemobox(comp) if not isinstance(comp, Fragment) else "",
@@ -947,19 +1077,58 @@ def generate_props(src, component, comp):
     )
 
 
-# Default event triggers.
-default_triggers = rx.Component.create().get_event_triggers()
+def get_trigger_args(spec) -> list:
+    """Get the argument names of an event trigger spec.
 
+    Args:
+        spec: The args spec, or a sequence of args specs.
 
-import inspect
+    Returns:
+        The argument names, or a list of them for a sequence of specs.
+    """
+    if isinstance(spec, Sequence):
+        return [get_trigger_args(s) for s in spec]
+    return inspect.getfullargspec(spec).args
 
 
-def same_trigger(t1, t2):
-    if t1 is None or t2 is None:
-        return False
-    args1 = inspect.getfullargspec(t1).args
-    args2 = inspect.getfullargspec(t2).args
-    return args1 == args2
+def get_event_triggers(comp) -> dict:
+    """Get the event triggers of a component class without creating it.
+
+    Args:
+        comp: The component class.
+
+    Returns:
+        The event triggers.
+    """
+    try:
+        # The triggers only depend on the class, so a bare instance is enough.
+        return comp.get_event_triggers(comp.__new__(comp))
+    except Exception:
+        return comp().get_event_triggers()
+
+
+# The argument names of the default event triggers.
+default_trigger_args = {
+    event: get_trigger_args(spec)
+    for event, spec in get_event_triggers(rx.Component).items()
+}
+
+
+def get_custom_triggers(comp) -> list[tuple[str, list]]:
+    """Get the event triggers of a component that differ from the default ones.
+
+    Args:
+        comp: The component class.
+
+    Returns:
+        The name and argument names of each custom trigger.
+    """
+    triggers = []
+    for event, spec in get_event_triggers(comp).items():
+        args = get_trigger_args(spec)
+        if args != default_trigger_args.get(event):
+            triggers.append((event, args))
+    return triggers
 
 
 def generate_event_triggers(comp, src):
@@ -968,11 +1137,11 @@ def generate_event_triggers(comp, src):
         for prop in src.get_props()
         if prop.name.startswith("on_")
     }
-    triggers = comp().get_event_triggers()
     custom_events = [
         event
-        for event in triggers
-        if not same_trigger(triggers.get(event), default_triggers.get(event))
+        for event, _ in get_bundle().get(
+            "triggers", comp, lambda: get_custom_triggers(comp)
+        )
     ]
 
     if not custom_events:
@@ -1137,10 +1306,10 @@ def multi_docs(path, comp, component_list, title):
 
     @docpage(set_path=path, t=title)
     def out():
-        toc = get_toc(comp, fname, component_list)
-        return toc, rx.box(
+        toc, content = xd.render_with_toc(comp, fname)
+        return toc + get_api_reference_toc(component_list), rx.box(
             links("hl", ll_doc_exists, path),
-            xd.render(comp, filename=fname),
+            content,
             h1_comp(text="API Reference"),
             rx.box(*components, class_name="flex flex-col"),
             class_name="flex flex-col w-full",
@@ -1150,11 +1319,11 @@ def multi_docs(path, comp, component_list, title):
     def ll():
         nonlocal fname
         fname = fname.replace(".md", "-ll.md")
-        d2 = flexdown.parse_file(fname)
-        toc = get_toc(d2, fname, component_list)
-        return toc, rx.box(
+        d2 = parse_file(fname)
+        toc, content = xd.render_with_toc(d2, fname)
+        return toc + get_api_reference_toc(component_list), rx.box(
             links("ll", ll_doc_exists, path),
-            xd.render_file(fname),
+            content,
             h1_comp(text="API Reference"),
             rx.box(*components, class_name="flex flex-col"),
             class_name="flex flex-col w-full",
@@ -5,6 +5,7 @@ import re
 from typing import Callable, Type
 
 import reflex as rx
+from pcweb.api_reference import get_bundle
 from pcweb.templates.docpage import h1_comp, h2_comp
 from pcweb.flexdown import markdown
 
@@ -15,20 +16,6 @@ class Source(rx.Base):
     # The component to parse.
     module: Type
 
-    # The source code.
-    code: list[str] = []
-
-    def __init__(self, *args, **kwargs):
-        """Initialize the source code parser."""
-        super().__init__(*args, **kwargs)
-
-        # Get the source code.
-        self.code = [
-            line
-            for line in inspect.getsource(self.module).splitlines()
-            if len(line) > 0
-        ]
-
     def get_docs(self) -> str:
         """Get the docstring of the component.
 
@@ -50,58 +37,58 @@ class Source(rx.Base):
     def get_class_fields(self) -> list[dict]:
         if not issubclass(self.module, rx.Base):
             return []
-        out = self.get_annotations(self.module.__class_vars__)
-        return out
+        return self.get_annotations(self.module.__class_vars__, "class_fields")
 
     def get_fields(self) -> list[dict]:
         if not issubclass(self.module, rx.Base):
             return []
-        return self.get_annotations(self.module.__fields__)
-
-    def get_methods(self):
-        return [
-            dict(
-                name=name,
-                signature=str(
-                    inspect.signature(
-                        fn.__func__
-                        if isinstance(fn, (classmethod, staticmethod))
-                        else fn
-                    )
-                ),
-                description=(
-                    fn.__func__.__doc__
-                    if isinstance(fn, (classmethod, staticmethod))
-                    else fn.__doc__
+        return self.get_annotations(self.module.__fields__, "fields")
+
+    def get_methods(self) -> list[dict]:
+        """Get the public documented methods, from the API reference bundle if it has them."""
+        return get_bundle().get("methods", self.module, self._get_methods)
+
+    def _get_methods(self) -> list[dict]:
+        methods = []
+        for name, fn in self.module.__dict__.items():
+            if isinstance(fn, (classmethod, staticmethod)):
+                fn = fn.__func__
+            elif not isinstance(fn, Callable):
+                continue
+            if not fn.__doc__ or name.startswith("_") or name == "Config":
+                continue
+            methods.append(
+                dict(
+                    name=name,
+                    signature=str(inspect.signature(fn)),
+                    description=fn.__doc__.split("Args:")[0]
+                    .split("Returns:")[0]
+                    .strip(),
                 )
-                .split("Args:")[0]
-                .split("Returns:")[0]
-                .strip(),
-                params=dict(
-                    inspect.signature(
-                        fn.__func__
-                        if isinstance(fn, (classmethod, staticmethod))
-                        else fn
-                    ).parameters
-                ),
-                ret=inspect.signature(
-                    fn.__func__ if isinstance(fn, (classmethod, staticmethod)) else fn
-                ).return_annotation,
-            )
-            for name, fn in self.module.__dict__.items()
-            if (
-                fn.__func__.__doc__
-                if isinstance(fn, (classmethod, staticmethod))
-                else fn.__doc__
             )
-            and (
-                isinstance(fn, Callable) or isinstance(fn, (classmethod, staticmethod))
-            )
-            and not name.startswith("_")
-            and name != "Config"
+        return methods
+
+    def get_annotations(self, props, kind: str) -> list[dict]:
+        """Get the documented fields, from the API reference bundle if it has them.
+
+        Args:
+            props: The fields of the class.
+            kind: The kind of fields.
+
+        Returns:
+            A dictionary of the props and their descriptions.
+        """
+        annotations = get_bundle().get(
+            kind, self.module, lambda: self._get_annotations(props)
+        )
+        return [
+            dict(prop=props[annotation["name"]], description=annotation["description"])
+            for annotation in annotations
+            # Skip the fields the class no longer has.
+            if annotation["name"] in props
         ]
 
-    def get_annotations(self, props) -> list[dict]:
+    def _get_annotations(self, props) -> list[dict]:
         """Get a dictionary of the props and their descriptions.
 
         Returns:
@@ -110,9 +97,14 @@ class Source(rx.Base):
         # The output.
         out = []
 
+        # Get the source code.
+        code = [
+            line for line in inspect.getsource(self.module).splitlines() if len(line) > 0
+        ]
+
         comments = []
         # Loop through the source code.
-        for i, line in enumerate(self.code):
+        for i, line in enumerate(code):
             # Check if we've reached the functions.
             reached_functions = re.search("def ", line)
             if reached_functions:
@@ -142,11 +134,10 @@ class Source(rx.Base):
                 comments.clear()
                 continue
 
-            prop = props[prop]
             # redundant check just to double-check line above prop is a comment
             assert (
-                self.code[i - 1].strip().startswith("#")
-            ), f"Expected comment, got {self.code[i - 1]}"
+                code[i - 1].strip().startswith("#")
+            ), f"Expected comment, got {code[i - 1]}"
 
             # Get the comment for this prop.
             comment = Source.get_comment(comments)
@@ -160,7 +151,7 @@ class Source(rx.Base):
             # Add the prop to the output.
             out.append(
                 dict(
-                    prop=prop,
+                    name=prop,
                     description=comment,
                 )
             )
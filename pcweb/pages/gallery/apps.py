@@ -1,5 +1,5 @@
 import reflex as rx
-import flexdown
+from pcweb.content import load_collection
 from pcweb.flexdown import xd2 as xd
 from pcweb.templates.gallery_app_page import gallery_app_page
 from pcweb.components.icons import get_icon
@@ -11,22 +11,12 @@ from pcweb.components.code_card import gallery_app_card
 GALLERY_APPS_PATH = "templates/"
 
 
-def get_gallery_apps(paths):
-    gallery_apps = {}
-    for path in reversed(sorted(paths)):
-        document = flexdown.parse_file(path)
-        path = path.replace(".md", "/")
-        gallery_apps[path] = document
-    return gallery_apps
-
-
 def get_route(path: str):
     """Get the route for a page."""
     return path.replace(GALLERY_APPS_PATH, "").replace(".md", "")
 
 
-paths = flexdown.utils.get_flexdown_files(GALLERY_APPS_PATH)
-gallery_apps_data = get_gallery_apps(paths)
+gallery_apps_data = load_collection(GALLERY_APPS_PATH)
 gallery_apps_data_copy = gallery_apps_data.copy()
 
 
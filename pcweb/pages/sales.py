@@ -1,12 +1,10 @@
-import httpx
+import asyncio
+
 import reflex as rx
-from httpx import Response
 
+from pcweb import outbox
 from pcweb.components.button import button
 from pcweb.components.webpage.comps import h1_title
-from pcweb.constants import (
-    REFLEX_DEV_WEB_LANDING_FORM_SALES_CALL_WEBHOOK_URL,
-)
 from pcweb.pages.docs import getting_started, hosting
 from pcweb.templates.webpage import webpage
 
@@ -20,22 +18,10 @@ class FormState(rx.State):
         self.is_loading = True
         yield
 
-        try:
-            with httpx.Client() as client:
-                response = client.post(
-                    REFLEX_DEV_WEB_LANDING_FORM_SALES_CALL_WEBHOOK_URL,
-                    json=form_data,
-                )
-                response.raise_for_status()
-
-            self.is_loading = False
-            self.email_sent = True
-            yield rx.toast.success("Demo request submitted successfully!")
-
-        except httpx.HTTPError:
-            self.is_loading = False
-            self.email_sent = False
-            yield rx.toast.error("Failed to submit request. Please try again later.")
+        await asyncio.to_thread(outbox.enqueue, ("sales", form_data))
+        self.is_loading = False
+        self.email_sent = True
+        yield rx.toast.success("Demo request received!")
 
 def dialog(trigger: rx.Component, content: rx.Component) -> rx.Component:
     return rx.dialog.root(
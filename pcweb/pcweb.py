@@ -4,12 +4,20 @@ import os
 import sys
 
 import reflex as rx
+from pcweb import profiling
+
+# Profile the startup if REFLEX_WEB_PROFILE_STARTUP is set.
+profiling.start()
+
 from pcweb import styles
-from pcweb.pages import page404, routes
+
+with profiling.phase("pages"):
+    from pcweb.pages import page404, routes
 from pcweb.pages.docs import outblocks, exec_blocks
 from pcweb.whitelist import _check_whitelisted_path
 from pcweb.telemetry import get_pixel_website_trackers
 from pcweb.meta.meta import favicons_links
+from pcweb import batch_writer, http_client, lazy, outbox
 
 # This number discovered by trial and error on Windows 11 w/ Node 18, any
 # higher and the prod build fails with EMFILE error.
@@ -17,7 +25,10 @@ WINDOWS_MAX_ROUTES = int(os.environ.get("REFLEX_WEB_WINDOWS_MAX_ROUTES", "100"))
 
 # Execute all the exec blocks in the documents.
 for doc, href in outblocks:
-    exec_blocks(doc, href)
+    # Lazy placeholders are built without the document.
+    if lazy.is_built(href):
+        with profiling.phase("exec_blocks", doc.filename):
+            exec_blocks(doc, href)
 
 # Create the app.
 app = rx.App(
@@ -47,6 +58,15 @@ app = rx.App(
     ],
 )
 
+# Close the shared webhook client when the backend shuts down.
+app.register_lifespan_task(http_client.lifespan)
+
+# Deliver the queued form submissions in the background.
+app.register_lifespan_task(outbox.worker)
+
+# Write the buffered feedback and signups periodically and on shutdown.
+app.register_lifespan_task(batch_writer.writer.lifespan)
+
 # XXX: The app is TOO BIG to build on Windows, so explicitly disallow it except for testing
 if sys.platform == "win32":
     if not os.environ.get("REFLEX_WEB_WINDOWS_OVERRIDE"):
@@ -72,6 +92,11 @@ for route in routes:
             ],
         }
 
+        # In lazy dev mode, pages are only built once they are visited.
+        if not lazy.is_built(route.path):
+            page_args["component"] = lazy.placeholder(route.path)
+            page_args["on_load"] = lazy.LazyRouteState.build_page(route.path)
+
         # Add the description only if it is not None
         if route.description is not None:
             page_args["description"] = route.description
@@ -80,7 +105,8 @@ for route in routes:
             page_args["meta"].extend(route.meta)
 
         # Call add_page with the dynamically constructed arguments
-        app.add_page(**page_args)
+        with profiling.phase("add_page"):
+            app.add_page(**page_args)
 
 # Add redirects
 redirects = [
@@ -143,3 +169,6 @@ for source, target in redirects:
         app.add_page(lambda: rx.fragment(), route=source, on_load=rx.redirect(target))
 
 app.add_page(page404.component, route=page404.path)
+
+# Write the startup profile now that all the pages are added.
+profiling.finish()
@@ -0,0 +1,143 @@
+"""Startup profiling for the site.
+
+Set REFLEX_WEB_PROFILE_STARTUP when running `reflex run` or `reflex export` to
+record how long each build phase and each document takes. The phases are timed
+where pcweb builds the app: discovering and parsing the docs, building the
+pages, running the exec blocks and adding the pages. Reflex's own compile of
+the app comes after that and is not included. Once the pages are added, the
+profiler writes to REFLEX_WEB_PROFILE_DIR (default `.web/pcweb_profile`):
+
+- `startup.json`: the phase timings and the slowest documents.
+- `startup.prof`: a cProfile dump of the app startup, which can be opened with
+  snakeviz or turned into a flamegraph with flameprof.
+
+Set REFLEX_WEB_PROFILE_BUDGET to a JSON file mapping phase names to a maximum
+number of seconds to fail the build when a phase goes over its budget, e.g.
+`{"parse": 5, "add_page": 30}`.
+"""
+
+import contextlib
+import cProfile
+import json
+import os
+import time
+from collections import defaultdict
+from pathlib import Path
+
+# Set this to profile the startup.
+ENABLED = bool(os.environ.get("REFLEX_WEB_PROFILE_STARTUP", False))
+
+# The directory the reports are written to.
+PROFILE_DIR = Path(os.environ.get("REFLEX_WEB_PROFILE_DIR", ".web/pcweb_profile"))
+
+# The number of documents listed in the report.
+TOP_DOCUMENTS = 50
+
+_profiler = None
+_started_at = None
+
+# The total seconds spent in each phase.
+_phases: dict[str, float] = defaultdict(float)
+
+# The seconds spent on each document, per phase.
+_documents: dict[str, dict[str, float]] = defaultdict(lambda: defaultdict(float))
+
+
+def start():
+    """Start profiling the startup, if enabled."""
+    global _profiler, _started_at
+    if not ENABLED or _profiler is not None:
+        return
+    _started_at = time.perf_counter()
+    _profiler = cProfile.Profile()
+    _profiler.enable()
+
+
+@contextlib.contextmanager
+def phase(name: str, document: str | None = None):
+    """Time a block of the startup.
+
+    Args:
+        name: The name of the phase the block belongs to.
+        document: The document the block works on, if any.
+
+    Yields:
+        Nothing.
+    """
+    if not ENABLED:
+        yield
+        return
+    start_time = time.perf_counter()
+    try:
+        yield
+    finally:
+        seconds = time.perf_counter() - start_time
+        _phases[name] += seconds
+        if document is not None:
+            _documents[str(document)][name] += seconds
+
+
+def get_report() -> dict:
+    """Get the timings recorded so far.
+
+    Returns:
+        The report.
+    """
+    documents = sorted(
+        _documents.items(), key=lambda item: sum(item[1].values()), reverse=True
+    )
+    return {
+        "total": time.perf_counter() - _started_at if _started_at else None,
+        "phases": dict(sorted(_phases.items(), key=lambda item: -item[1])),
+        "documents": [
+            {"document": document, "total": sum(phases.values()), **phases}
+            for document, phases in documents[:TOP_DOCUMENTS]
+        ],
+    }
+
+
+def check_budget(report: dict, budget: dict[str, float]) -> list[str]:
+    """Check the phase timings against a budget.
+
+    Args:
+        report: The profiling report.
+        budget: The maximum seconds for each phase.
+
+    Returns:
+        A message for each phase over its budget.
+    """
+    timings = {"total": report["total"], **report["phases"]}
+    return [
+        f"{name} took {timings[name]:.2f}s, over its budget of {limit:.2f}s"
+        for name, limit in budget.items()
+        if timings.get(name) is not None and timings[name] > limit
+    ]
+
+
+def finish():
+    """Write the reports and check the budget.
+
+    Raises:
+        RuntimeError: If a phase is over its budget.
+    """
+    global _profiler
+    if _profiler is None:
+        return
+    _profiler.disable()
+
+    report = get_report()
+    PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+    _profiler.dump_stats(PROFILE_DIR / "startup.prof")
+    (PROFILE_DIR / "startup.json").write_text(json.dumps(report, indent=2))
+    _profiler = None
+
+    print(f"Startup profile written to {PROFILE_DIR}")
+    for name, seconds in report["phases"].items():
+        print(f"  {name}: {seconds:.2f}s")
+
+    budget_file = os.environ.get("REFLEX_WEB_PROFILE_BUDGET")
+    if budget_file:
+        errors = check_budget(report, json.loads(Path(budget_file).read_text()))
+        if errors:
+            raise RuntimeError("Startup budget exceeded:\n" + "\n".join(errors))
+
@@ -1,18 +1,14 @@
-import contextlib
+import asyncio
 import json
-import os
 from datetime import datetime
 from typing import Any
 
-import httpx
 import reflex as rx
-from email_validator import EmailNotValidError, ValidatedEmail, validate_email
+from email_validator import EmailNotValidError
 from sqlmodel import Field
 
-from pcweb.constants import (
-    API_BASE_URL_LOOPS,
-    REFLEX_DEV_WEB_NEWSLETTER_FORM_WEBHOOK_URL,
-)
+from pcweb import email_validation, outbox
+from pcweb.batch_writer import writer
 
 
 class Waitlist(rx.Model, table=True):
@@ -29,53 +25,12 @@ class IndexState(rx.State):
     # Whether to show the confetti.
     show_confetti: bool = False
 
-    def send_contact_to_webhook(
-        self,
-        email: str,
-    ) -> None:
-        with contextlib.suppress(httpx.HTTPError) and httpx.Client() as client:
-            response = client.post(
-                REFLEX_DEV_WEB_NEWSLETTER_FORM_WEBHOOK_URL,
-                json={
-                    "email": email,
-                },
-            )
-            response.raise_for_status()
-
-    def add_contact_to_loops(
-        self,
-        email: str,
-    ):
-        url: str = f"{API_BASE_URL_LOOPS}/contacts/create"
-        loops_api_key: str | None = os.getenv("LOOPS_API_KEY")
-        if loops_api_key is None:
-            print("Loops API key does not exist")
-            return
-
-        headers = {
-            "Accept": "application/json",
-            "Authorization": f"Bearer {loops_api_key}",
-        }
-        try:
-            with httpx.Client() as client:
-                response = client.post(
-                    url,
-                    headers=headers,
-                    json={
-                        "email": email,
-                    },
-                )
-                response.raise_for_status()  # Raise an exception for HTTP errors (4xx and 5xx)
-
-        except httpx.HTTPError as e:
-            print(f"An error occurred: {e}")
-
     @rx.event
     def signup_for_another_user(self):
         self.signed_up = False
 
     @rx.event
-    def signup(
+    async def signup(
         self,
         form_data: dict[str, Any],
     ):
@@ -83,11 +38,7 @@ class IndexState(rx.State):
         email: str | None = None
         if email_to_validate := form_data.get("input_email"):
             try:
-                validated_email: ValidatedEmail = validate_email(
-                    email_to_validate,
-                    check_deliverability=True,
-                )
-                email = validated_email.normalized
+                email = await email_validation.validate(email_to_validate)
 
             except EmailNotValidError as e:
                 # Alert the error message.
@@ -98,7 +49,12 @@ class IndexState(rx.State):
                         "background": "linear-gradient(218deg, #1D1B23 -35.66%, #131217 100.84%)",
                     },
                 )
-        self.send_contact_to_webhook(email)
-        self.add_contact_to_loops(email)
+        if email is not None:
+            writer.add(Waitlist(email=email))
+            await asyncio.to_thread(
+                outbox.enqueue,
+                ("newsletter", {"email": email}),
+                ("loops", {"email": email}),
+            )
         self.signed_up = True
         return rx.toast.success("Thanks for signing up to the Newsletter!")
\ No newline at end of file
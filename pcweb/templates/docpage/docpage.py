@@ -1,10 +1,10 @@
 """Template for documentation pages."""
 
+import re
 from datetime import datetime
 from typing import Callable
 
 import reflex as rx
-import flexdown
 import mistletoe
 from pcweb.route import Route, get_path
 from .blocks import *
@@ -315,65 +315,47 @@ def breadcrumb(path: str, nav_sidebar: rx.Component):
     )
 
 
-def get_headings(comp):
-    """Get the strings from markdown component."""
-    if isinstance(comp, mistletoe.block_token.Heading):
-        heading_text = "".join(
-            token.content for token in comp.children if hasattr(token, "content")
-        )
-        return [(comp.level, heading_text)]
+# Matches an ATX heading line.
+HEADING_REGEX = re.compile(r"^ {0,3}(#{1,6})[ \t]+(.*?)(?:[ \t]+#+)?[ \t]*$")
 
-    # Recursively get the strings from the children.
-    if not hasattr(comp, "children") or comp.children is None:
-        return []
 
-    headings = []
-    for child in comp.children:
-        headings.extend(get_headings(child))
-    return headings
+def heading_anchor(text: str) -> str:
+    """Get the anchor id the heading components give a heading."""
+    return text.lower().replace(" ", "-")
 
 
-def get_toc(source, href, component_list=None):
-    from pcweb.flexdown import xd
+def get_headings(content: str) -> list[tuple[int, str, str]]:
+    """Get the TOC entries for the headings in a markdown block.
 
-    component_list = component_list or []
-    component_list = component_list[1:]
+    The heading components render and link the first text child of a heading,
+    so that is what the entry shows and links to.
 
-    # Generate the TOC
-    # The environment used for execing and evaling code.
-    env = source.metadata
-    env["__xd"] = xd
-
-    # Get the content of the document.
-    source = source.content
-
-    # Get the blocks in the source code.
-    # Note: we must use reflex-web's special flexdown instance xd here - it knows about all custom block types (like DemoBlock)
-    blocks = xd.get_blocks(source, href)
+    Args:
+        content: The content of the markdown block.
 
-    content_pieces = []
-    for block in blocks:
-        if (
-            not isinstance(block, flexdown.blocks.MarkdownBlock)
-            or len(block.lines) == 0
-            or not block.lines[0].startswith("#")
-        ):
+    Returns:
+        The level, text and anchor id of each heading.
+    """
+    headings = []
+    for line in content.splitlines():
+        match = HEADING_REGEX.match(line)
+        if match is None:
             continue
-        # Now we should have all the env entries we need
-        content = block.get_content(env)
-        content_pieces.append(content)
-
-    content = "\n".join(content_pieces)
-    doc = mistletoe.Document(content)
+        tokens = mistletoe.span_token.tokenize_inner(match.group(2))
+        if tokens and isinstance(tokens[0], mistletoe.span_token.RawText):
+            text = tokens[0].content
+            headings.append((len(match.group(1)), text, heading_anchor(text)))
+    return headings
 
-    # Parse the markdown headers.
-    headings = get_headings(doc)
 
-    if len(component_list):
-        headings.append((1, "API Reference"))
-    for component_tuple in component_list:
-        headings.append((2, component_tuple[1]))
-    return headings
+def get_api_reference_toc(component_list) -> list[tuple[int, str, str]]:
+    """Get the TOC entries for the API reference of a component page."""
+    if len(component_list) < 2:
+        return []
+    toc = [(1, "API Reference", heading_anchor("API Reference"))]
+    for component_tuple in component_list[1:]:
+        toc.append((2, component_tuple[1], heading_anchor(component_tuple[1])))
+    return toc
 
 
 def docpage(
@@ -427,8 +409,8 @@ def docpage(
             # Create the docpage sidebar.
             sidebar = sb(url=path, width="300px")
 
-            # Set the sidebar path for the navbar sidebar.
-            nav_sidebar = sb(url=path, width="100%")
+            # The navbar drawer shows the same sidebar.
+            nav_sidebar = sidebar
 
             # Get the previous and next sidebar links.
             prev, next = get_prev_next(path)
@@ -545,9 +527,7 @@ def docpage(
                                                 text,
                                                 class_name="font-small text-slate-9 hover:!text-slate-11 truncate transition-color",
                                                 underline="none",
-                                                href=path
-                                                + "#"
-                                                + text.lower().replace(" ", "-"),
+                                                href=path + "#" + anchor,
                                             )
                                         )
                                         if level == 1
@@ -557,9 +537,7 @@ def docpage(
                                                     text,
                                                     class_name="font-small text-slate-9 hover:!text-slate-11 truncate transition-color",
                                                     underline="none",
-                                                    href=path
-                                                    + "#"
-                                                    + text.lower().replace(" ", "-"),
+                                                    href=path + "#" + anchor,
                                                 )
                                             )
                                             if level == 2
@@ -568,14 +546,12 @@ def docpage(
                                                     text,
                                                     underline="none",
                                                     class_name="pl-6 font-small text-slate-9 hover:!text-slate-11 truncate transition-color",
-                                                    href=path
-                                                    + "#"
-                                                    + text.lower().replace(" ", "-"),
+                                                    href=path + "#" + anchor,
                                                 )
                                             )
                                         )
                                     )
-                                    for level, text in toc
+                                    for level, text, anchor in toc
                                 ],
                                 class_name="flex flex-col gap-4 list-none",
                             ),
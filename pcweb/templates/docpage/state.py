@@ -1,19 +1,23 @@
 """The state for the navbar component."""
 
-import contextlib
+import asyncio
 import os
 from datetime import datetime
 from typing import Any, Optional, Set
 
-import httpx
 import reflex as rx
-from httpx import Response
-from sqlmodel import Field
+import sqlalchemy
+from sqlalchemy import case, func
+from sqlmodel import Field, select
 
-from pcweb.constants import REFLEX_DEV_WEB_GENERAL_FORM_FEEDBACK_WEBHOOK_URL
+from pcweb import outbox
+from pcweb.batch_writer import writer
 
 
 class Feedback(rx.Model, table=True):
+    # Index the scores by page for the per-page stats.
+    __table_args__ = (sqlalchemy.Index("ix_feedback_page_score", "page", "score"),)
+
     email: Optional[str]
     feedback: str
     score: Optional[int]
@@ -21,28 +25,61 @@ class Feedback(rx.Model, table=True):
     page: str
 
 
+class FeedbackStats(rx.Base):
+    """The feedback counts of a page."""
+
+    page: str
+    total: int
+    thumbs_up: int
+    thumbs_down: int
+
+
+def get_feedback_stats(page: str | None = None) -> list[FeedbackStats]:
+    """Count the feedback of each page.
+
+    Args:
+        page: The page to count the feedback of, or None for all pages.
+
+    Returns:
+        The counts of each page, most feedback first.
+    """
+    query = (
+        select(
+            Feedback.page,
+            func.count(),
+            func.count(case((Feedback.score == 1, 1))),
+            func.count(case((Feedback.score == 0, 1))),
+        )
+        .group_by(Feedback.page)
+        .order_by(func.count().desc())
+    )
+    if page is not None:
+        query = query.where(Feedback.page == page)
+    with rx.session() as session:
+        return [
+            FeedbackStats(
+                page=route, total=total, thumbs_up=thumbs_up, thumbs_down=thumbs_down
+            )
+            for route, total, thumbs_up, thumbs_down in session.exec(query).all()
+        ]
+
+
 class FeedbackState(rx.State):
     """The state for feedback components"""
 
     score: Optional[int] = None
 
     @rx.event
-    def handle_submit(self, form_data: dict):
+    async def handle_submit(self, form_data: dict):
         feedback = form_data["feedback"]
         if len(feedback) < 10 or len(feedback) > 500:
-            return rx.toast.warning(
+            yield rx.toast.warning(
                 "Please enter your feedback. Between 10 and 500 characters.",
                 close_button=True,
             )
+            return
 
         current_page_route: str = self.router.page.raw_path
-        with contextlib.suppress(httpx.HTTPError) and httpx.Client() as client:
-            client.post(
-                REFLEX_DEV_WEB_GENERAL_FORM_FEEDBACK_WEBHOOK_URL,
-                json=form_data,
-            )
-
-        discord_webhook_url: str | None = REFLEX_DEV_WEB_GENERAL_FORM_FEEDBACK_WEBHOOK_URL
         email: str = form_data.get("email", "")
         discord_message = f"""
 Contact: {email}
@@ -50,24 +87,18 @@ Page: {current_page_route}
 Score: {"👍" if self.score == 1 else "👎"}
 Feedback: {feedback}
 """
-        payload = {"content": discord_message}
-        try:
-            with httpx.Client() as client:
-                response: Response = client.post(
-                    discord_webhook_url,
-                    json=payload,
-                )
-                response.raise_for_status()
-
-        except httpx.HTTPError:
-            return rx.toast.error(
-                """An error occurred while submitting your feedback. If the issue persists,
-please file a Github issue or stop by our Discord.""",
-                close_button=True,
-            )
-
-        else:
-            yield rx.toast.success(
-                "Thank you for your feedback!",
-                close_button=True,
+        writer.add(
+            Feedback(
+                email=email or None,
+                feedback=feedback,
+                score=self.score,
+                page=current_page_route.split("?")[0].split("#")[0],
             )
+        )
+        await asyncio.to_thread(
+            outbox.enqueue, ("feedback", {"content": discord_message})
+        )
+        yield rx.toast.success(
+            "Thank you for your feedback!",
+            close_button=True,
+        )
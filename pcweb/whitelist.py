@@ -9,22 +9,132 @@
 # - Correct: WHITELISTED_PAGES = ["/docs/getting-started/introduction"]
 # - Incorrect: WHITELISTED_PAGES = ["/docs/getting-started/introduction/"]
 
-WHITELISTED_PAGES = [] 
+# Instead of editing this file, the pages can also be set with environment
+# variables holding comma separated patterns:
+# - REFLEX_WEB_WHITELIST: the pages to build.
+# - REFLEX_WEB_EXCLUDE: the pages to leave out, even if they are whitelisted.
+# A pattern without wildcards matches every path starting with it, like the
+# entries above. In a pattern with wildcards, `*` matches within one path
+# segment and `**` matches across segments, e.g. "/docs/library/**/button".
+
+# Pages that the whitelisted docs link to are built as well, and so are the
+# pages those link to, so a partial build has no broken links.
+
+import os
+import re
+
+WHITELISTED_PAGES = []
+
+
+def _get_env_patterns(name):
+    return [
+        pattern.strip().rstrip("/") or "/"
+        for pattern in os.environ.get(name, "").split(",")
+        if pattern.strip()
+    ]
+
+
+def _glob_to_regex(pattern):
+    """Compile a glob pattern into a regex matching the full path."""
+    parts = re.split(r"(\*\*|\*|\?)", pattern)
+    wildcards = {"**": ".*", "*": "[^/]*", "?": "[^/]"}
+    return re.compile(
+        "".join(wildcards.get(part, re.escape(part)) for part in parts)
+    )
+
+
+class _PatternTrie:
+    """A character trie of the literal prefixes of a set of patterns.
+
+    Checking a path walks the trie along the path once. Plain prefixes match
+    as soon as their node is reached, and the remaining glob of a wildcard
+    pattern is only tried at the node of its literal prefix.
+    """
+
+    def __init__(self, patterns):
+        self.root = {}
+        self.active = bool(patterns)
+        for pattern in patterns:
+            # The root alone means only the root is built.
+            if pattern == "/":
+                continue
+            match = re.search(r"[*?]", pattern)
+            prefix = pattern if match is None else pattern[: match.start()]
+            node = self.root
+            for char in prefix:
+                node = node.setdefault(char, {})
+            if match is None:
+                node[""] = True
+            else:
+                node.setdefault(None, []).append(_glob_to_regex(pattern))
+
+    def __bool__(self):
+        return self.active
+
+    def matches(self, path):
+        node = self.root
+        for i in range(len(path) + 1):
+            if node.get(""):
+                return True
+            for regex in node.get(None, ()):
+                if regex.fullmatch(path):
+                    return True
+            if i == len(path) or path[i] not in node:
+                return False
+            node = node[path[i]]
+        return False
 
- 
-def _check_whitelisted_path(path):
-    if len(WHITELISTED_PAGES) == 0:
-        return True
 
+_include = None
+_exclude = None
+
+# Exact pages added on top of the patterns, e.g. the pages linked from whitelisted docs.
+_extra_paths = set()
+
+
+def _get_tries():
+    global _include, _exclude
+    if _include is None:
+        _include = _PatternTrie(
+            WHITELISTED_PAGES + _get_env_patterns("REFLEX_WEB_WHITELIST")
+        )
+        _exclude = _PatternTrie(_get_env_patterns("REFLEX_WEB_EXCLUDE"))
+    return _include, _exclude
+
+
+def is_whitelist_active():
+    """Whether only a subset of the pages is built."""
+    include, exclude = _get_tries()
+    return bool(include) or bool(exclude)
+
+
+def has_whitelist():
+    """Whether only the whitelisted pages are built, rather than all but the excluded ones."""
+    include, _ = _get_tries()
+    return bool(include)
+
+
+def is_excluded(path):
+    """Whether a page is left out, even if it is whitelisted or linked."""
+    _, exclude = _get_tries()
+    return exclude.matches(path.rstrip("/") or "/")
+
+
+def add_whitelisted_paths(paths):
+    """Build the given pages as well, unless they are excluded."""
+    _extra_paths.update(path.rstrip("/") or "/" for path in paths)
+
+
+def _check_whitelisted_path(path):
     # If the path is the root, always build it.
     if path == "/":
         return True
 
-    if len(WHITELISTED_PAGES) == 1 and WHITELISTED_PAGES[0] == "/":
+    include, exclude = _get_tries()
+    path = path.rstrip("/") or "/"
+    if exclude.matches(path):
         return False
+    if not include or path in _extra_paths:
+        return True
 
-    for whitelisted_path in WHITELISTED_PAGES:
-        if path.startswith(whitelisted_path):
-            return True
-
-    return False
+    return include.matches(path)
@@ -0,0 +1,108 @@
+"""Benchmarks for the docs build pipeline.
+
+These need pytest-benchmark and are skipped without it. Run them from the repo
+root, saving or comparing against a baseline:
+
+    pytest tests/benchmarks --benchmark-autosave
+    pytest tests/benchmarks --benchmark-compare
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+ROOT = Path(__file__).resolve().parent.parent.parent
+sys.path.append(str(ROOT))
+
+import flexdown  # noqa: E402
+
+from pcweb import api_reference, cache  # noqa: E402
+
+DOCS = sorted(str(path) for path in (ROOT / "docs").rglob("*.md"))
+
+# A long guide with exec blocks and a component library page.
+RENDERED_DOC = str(ROOT / "docs/state/overview.md")
+LIBRARY_DOC = str(ROOT / "docs/library/forms/button.md")
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    """Keep the build caches of every benchmark out of the checkout."""
+    monkeypatch.setattr(cache, "CACHE_DIR", tmp_path)
+    monkeypatch.setattr(cache, "CACHE_DISABLED", False)
+    monkeypatch.setattr(cache, "_caches", {})
+    monkeypatch.setattr(api_reference, "CACHE_DIR", tmp_path)
+    monkeypatch.setattr(api_reference, "CACHE_DISABLED", False)
+    monkeypatch.setattr(api_reference, "_bundle", None)
+    return tmp_path
+
+
+@pytest.fixture
+def cold_cache(monkeypatch):
+    monkeypatch.setattr(cache, "CACHE_DISABLED", True)
+    monkeypatch.setattr(api_reference, "CACHE_DISABLED", True)
+
+
+def test_parse_docs(benchmark):
+    benchmark(lambda: [flexdown.parse_file(doc) for doc in DOCS])
+
+
+def test_parse_docs_cold_cache(benchmark, cold_cache):
+    benchmark(lambda: [cache.parse_file(doc) for doc in DOCS])
+
+
+def test_parse_docs_warm_cache(benchmark):
+    for doc in DOCS:
+        cache.parse_file(doc)
+    benchmark(lambda: [cache.parse_file(doc) for doc in DOCS])
+
+
+def test_render_with_toc(benchmark):
+    from pcweb.flexdown import xd
+
+    benchmark(lambda: xd.render_with_toc(cache.parse_file(RENDERED_DOC), RENDERED_DOC))
+
+
+def test_introspect_props(benchmark, cold_cache):
+    """Read the props of a component from source, without any of the caches."""
+    from pcweb.pages.docs import component
+    from reflex.components.radix.themes.components.button import Button
+
+    def clear_caches():
+        component.get_module_props.cache_clear()
+        component.get_component_props.cache_clear()
+        api_reference._bundle = None
+
+    benchmark.pedantic(
+        component.introspect_props,
+        args=(Button,),
+        setup=clear_caches,
+        rounds=20,
+        iterations=1,
+    )
+
+
+def test_generate_props(benchmark):
+    from pcweb.pages.docs.component import Source, generate_props
+    from reflex.components.radix.themes.components.button import Button
+
+    document = cache.parse_file(LIBRARY_DOC)
+    benchmark(lambda: generate_props(Source(component=Button), Button, document))
+
+
+def test_import_pages(benchmark, cache_dir):
+    """Build every route from a fresh interpreter, with warm caches."""
+    env = {**os.environ, "REFLEX_WEB_CACHE_DIR": str(cache_dir)}
+    benchmark.pedantic(
+        subprocess.run,
+        args=([sys.executable, "-c", "import pcweb.pages"],),
+        kwargs={"cwd": ROOT, "check": True, "env": env},
+        rounds=3,
+        iterations=1,
+        warmup_rounds=1,
+    )
@@ -0,0 +1,62 @@
+"""Tests for the API reference bundle."""
+
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from pcweb import api_reference  # noqa: E402
+
+
+class Documented:
+    pass
+
+
+def test_bundle_round_trip(tmp_path, monkeypatch):
+    monkeypatch.setattr(api_reference, "CACHE_DISABLED", False)
+    monkeypatch.setattr(api_reference, "get_source_digest", lambda cls: "1")
+    path = tmp_path / "bundle.json"
+
+    bundle = api_reference.Bundle(path)
+    assert bundle.get("props", Documented, lambda: [{"name": "a"}]) == [{"name": "a"}]
+    bundle.save()
+
+    reloaded = api_reference.Bundle(path)
+    assert reloaded.has("props", Documented)
+    assert reloaded.get("props", Documented, lambda: None) == [{"name": "a"}]
+
+    # Changing the source that defines the class invalidates its entries.
+    monkeypatch.setattr(api_reference, "get_source_digest", lambda cls: "2")
+    assert not reloaded.has("props", Documented)
+    assert reloaded.get("props", Documented, lambda: []) == []
+
+
+def test_source_digest(tmp_path, monkeypatch):
+    base_module = tmp_path / "documented_base.py"
+    base_module.write_text("class Base:\n    pass\n")
+    (tmp_path / "documented_child.py").write_text(
+        "from documented_base import Base\n\n\nclass Child(Base):\n    pass\n"
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+    from documented_child import Child
+
+    digest = api_reference.get_source_digest(Child)
+    assert digest == api_reference.get_source_digest(Child)
+
+    # Any change to the file of a base changes the digest of the class.
+    base_module.write_text("class Base:\n    renamed: int\n")
+    api_reference.get_file_digest.cache_clear()
+    api_reference.get_source_digest.cache_clear()
+    assert api_reference.get_source_digest(Child) != digest
+
+
+def test_bundle_path_follows_the_extractors(monkeypatch, tmp_path):
+    path = api_reference.get_bundle_path()
+    assert path == api_reference.get_bundle_path()
+
+    package = tmp_path / "pcweb"
+    for extractor in api_reference.EXTRACTORS:
+        (package / extractor).parent.mkdir(parents=True, exist_ok=True)
+        (package / extractor).write_text("# edited\n")
+    monkeypatch.setattr(api_reference, "__file__", str(package / "api_reference.py"))
+    assert api_reference.get_bundle_path() != path
@@ -0,0 +1,107 @@
+"""Tests for the buffered database writer."""
+
+import asyncio
+import contextlib
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from pcweb import batch_writer  # noqa: E402
+
+
+class Database:
+    """Stands in for the database, recording the committed batches."""
+
+    def __init__(self):
+        self.batches = []
+        self.failures = 0
+        self.on_commit = None
+
+    @contextlib.contextmanager
+    def session(self):
+        database = self
+
+        class Session:
+            def add_all(self, rows):
+                self.rows = list(rows)
+
+            def commit(self):
+                if database.on_commit is not None:
+                    database.on_commit()
+                if database.failures:
+                    database.failures -= 1
+                    raise ConnectionError("database is down")
+                database.batches.append(self.rows)
+
+        yield Session()
+
+
+@pytest.fixture
+def database(monkeypatch):
+    database = Database()
+    monkeypatch.setattr(batch_writer.rx, "session", database.session)
+    return database
+
+
+async def wait_for(condition):
+    for _ in range(100):
+        if condition():
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("timed out")
+
+
+def test_flushes_when_full(database):
+    async def main():
+        writer = batch_writer.BatchWriter(batch_size=3, batch_seconds=60)
+        async with writer.lifespan():
+            writer.add("a")
+            writer.add("b")
+            await asyncio.sleep(0.05)
+            assert database.batches == []
+
+            writer.add("c")
+            await wait_for(lambda: database.batches)
+            assert database.batches == [["a", "b", "c"]]
+
+    asyncio.run(main())
+
+
+def test_flushes_when_oldest_row_is_due(database):
+    async def main():
+        writer = batch_writer.BatchWriter(batch_size=50, batch_seconds=0.1)
+        async with writer.lifespan():
+            writer.add("a")
+            await asyncio.sleep(0.02)
+            writer.add("b")
+            assert database.batches == []
+            await wait_for(lambda: database.batches)
+            assert database.batches == [["a", "b"]]
+
+            # The rest is flushed on shutdown.
+            writer.add("c")
+        assert database.batches == [["a", "b"], ["c"]]
+
+    asyncio.run(main())
+
+
+def test_failed_flush_is_retried(database):
+    writer = batch_writer.BatchWriter(batch_size=50, batch_seconds=60)
+    writer.add("a")
+    writer.add("b")
+
+    # A row added while the failing insert runs is kept after the failed batch.
+    database.failures = 1
+    database.on_commit = lambda: writer.add("c")
+    writer.flush()
+    assert database.batches == []
+    assert writer.rows == ["a", "b", "c"]
+
+    database.on_commit = None
+    writer.flush()
+    assert database.batches == [["a", "b", "c"]]
+    assert writer.rows == []
+    assert not writer.is_due()
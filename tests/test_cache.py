@@ -0,0 +1,83 @@
+"""Tests for the on-disk build caches."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from pcweb import cache  # noqa: E402
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache, "CACHE_DIR", tmp_path)
+    monkeypatch.setattr(cache, "CACHE_DISABLED", False)
+    monkeypatch.setattr(cache, "_caches", {})
+    yield tmp_path
+
+
+def test_disk_cache_round_trip(cache_dir):
+    store = cache.DiskCache("test", version="1")
+    assert store.get("key", "digest") is cache.MISSING
+    store.set("key", {"value": 1}, "digest")
+    store.save()
+
+    reloaded = cache.DiskCache("test", version="1")
+    assert reloaded.get("key", "digest") == {"value": 1}
+    # A changed input is a miss.
+    assert reloaded.get("key", "other") is cache.MISSING
+    # A new version drops the whole store.
+    assert cache.DiskCache("test", version="2").get("key", "digest") is cache.MISSING
+
+
+def test_parse_file_uses_cache(cache_dir, tmp_path):
+    doc = tmp_path / "doc.md"
+    doc.write_text("---\ntitle: One\n---\n# Hello\n")
+
+    first = cache.parse_file(doc)
+    assert first.metadata == {"title": "One"}
+    assert first.filename == str(doc)
+
+    # Mutating the returned metadata must not leak into the cache.
+    first.metadata["__xd"] = object()
+    assert cache.parse_file(doc).metadata == {"title": "One"}
+
+    doc.write_text("---\ntitle: Two\n---\n# Hello\n")
+    assert cache.parse_file(doc).metadata == {"title": "Two"}
+
+
+def install(site, direct_url: str):
+    """Install a fake `documented-package` distribution into a site directory."""
+    dist_info = site / "documented_package-1.0.dist-info"
+    dist_info.mkdir(parents=True, exist_ok=True)
+    (dist_info / "METADATA").write_text("Name: documented-package\nVersion: 1.0\n")
+    (dist_info / "top_level.txt").write_text("documented_package\n")
+    (dist_info / "direct_url.json").write_text(direct_url)
+    cache.get_source_version.cache_clear()
+
+
+def test_source_version(tmp_path, monkeypatch):
+    package = tmp_path / "documented_package"
+    package.mkdir()
+    (package / "__init__.py").write_text("VALUE = 1\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    # A package from an index is versioned by its version.
+    install(tmp_path, "")
+    assert cache.get_source_version("documented-package") == "1.0"
+
+    # A package from git is versioned by its commit.
+    install(tmp_path, '{"url": "https://x", "vcs_info": {"vcs": "git", "commit_id": "abc"}}')
+    assert cache.get_source_version("documented-package") == "1.0+abc"
+
+    # A package from a local checkout is versioned by its source.
+    install(tmp_path, '{"url": "file:///x", "dir_info": {"editable": true}}')
+    version = cache.get_source_version("documented-package")
+    assert version.startswith("1.0+")
+    (package / "__init__.py").write_text("VALUE = 2\n")
+    cache.get_source_version.cache_clear()
+    assert cache.get_source_version("documented-package") not in (version, "1.0")
+
+    assert cache.get_source_version("not-installed-package") == ""
@@ -0,0 +1,63 @@
+"""Tests for the content collection loader."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from pcweb import cache, content  # noqa: E402
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache, "CACHE_DIR", tmp_path / "cache")
+    monkeypatch.setattr(cache, "CACHE_DISABLED", False)
+    monkeypatch.setattr(cache, "_caches", {})
+    yield tmp_path
+
+
+def test_load_collection(cache_dir, monkeypatch):
+    posts = cache_dir / "posts"
+    posts.mkdir()
+    (posts / "2024-01-01-old.md").write_text("---\ntitle: Old\n---\n# Old post\n")
+    (posts / "2024-06-01-new.md").write_text("---\ntitle: New\ntags: [a]\n---\nBody\n")
+    (posts / "no-front-matter.md").write_text("Just a body\n")
+    monkeypatch.chdir(cache_dir)
+
+    collection = content.load_collection("posts/")
+    assert list(collection) == [
+        "posts/no-front-matter/",
+        "posts/2024-06-01-new/",
+        "posts/2024-01-01-old/",
+    ]
+
+    new = collection["posts/2024-06-01-new/"]
+    assert new.metadata == {"title": "New", "tags": ["a"]}
+    # The body is only read when it is used.
+    assert new._content is None
+    assert new.content == "Body\n"
+    assert collection["posts/no-front-matter/"].metadata == {}
+    assert collection["posts/no-front-matter/"].content == "Just a body\n"
+
+
+def test_front_matter_is_cached(cache_dir, monkeypatch):
+    path = cache_dir / "post.md"
+    path.write_text("---\ntitle: Post\n---\nBody\n")
+    assert content.parse_front_matter(str(path)) == {"title": "Post"}
+
+    def fail(source):
+        raise AssertionError("parsed again")
+
+    monkeypatch.setattr(content.yaml, "safe_load", fail)
+    metadata = content.parse_front_matter(str(path))
+    assert metadata == {"title": "Post"}
+    # Each load gets its own copy.
+    metadata["title"] = "Changed"
+    assert content.parse_front_matter(str(path)) == {"title": "Post"}
+
+    # A changed front matter is parsed again.
+    path.write_text("---\ntitle: Renamed\n---\nBody\n")
+    with pytest.raises(AssertionError):
+        content.parse_front_matter(str(path))
@@ -0,0 +1,66 @@
+"""Tests for the email validation of the newsletter signup."""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+from email_validator import EmailNotValidError
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from pcweb import email_validation  # noqa: E402
+
+
+@pytest.fixture
+def lookups(monkeypatch):
+    """Replace the DNS lookups with a stub that records the looked up domains."""
+    looked_up = []
+    now = [0.0]
+
+    def lookup(domain, domain_i18n):
+        looked_up.append(domain)
+        return None if domain == "example.org" else f"{domain_i18n} does not exist"
+
+    cache = email_validation.DomainCache(lookup, ttl=60, clock=lambda: now[0])
+    monkeypatch.setattr(email_validation, "domain_cache", cache)
+    monkeypatch.setattr(email_validation, "OFFLINE", False)
+    return looked_up, now
+
+
+def validate(email):
+    return asyncio.run(email_validation.validate(email))
+
+
+def test_common_domains_skip_the_lookup(lookups):
+    looked_up, _ = lookups
+    assert validate("Someone@Gmail.com") == "Someone@gmail.com"
+    assert looked_up == []
+
+
+def test_lookups_are_cached_until_they_expire(lookups):
+    looked_up, now = lookups
+    assert validate("a@example.org") == "a@example.org"
+    assert validate("b@example.org") == "b@example.org"
+    assert looked_up == ["example.org"]
+
+    now[0] = 61
+    validate("c@example.org")
+    assert looked_up == ["example.org", "example.org"]
+
+
+def test_undeliverable_domains(lookups):
+    looked_up, _ = lookups
+    for _ in range(2):
+        with pytest.raises(EmailNotValidError, match="no-mail.org does not exist"):
+            validate("a@no-mail.org")
+    assert looked_up == ["no-mail.org"]
+
+
+def test_offline_only_checks_the_syntax(lookups, monkeypatch):
+    looked_up, _ = lookups
+    monkeypatch.setattr(email_validation, "OFFLINE", True)
+    assert validate("a@no-mail.org") == "a@no-mail.org"
+    with pytest.raises(EmailNotValidError):
+        validate("not an email")
+    assert looked_up == []
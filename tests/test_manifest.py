@@ -0,0 +1,86 @@
+"""Tests for the build manifest of the doc pages."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from pcweb import cache, lazy, manifest  # noqa: E402
+
+DOC = "docs/page.md"
+ROUTE = "/docs/page/"
+OUTPUT = Path(".web/pages/docs/page.js")
+
+
+@pytest.fixture
+def site(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(cache, "CACHE_DIR", tmp_path / "cache")
+    monkeypatch.setattr(cache, "CACHE_DISABLED", False)
+    monkeypatch.setattr(cache, "_caches", {})
+    monkeypatch.setattr(manifest, "ROOT", tmp_path)
+    monkeypatch.setattr(manifest, "TEMPLATE_DEPENDENCIES", [])
+    manifest.file_digest.cache_clear()
+    manifest.expand.cache_clear()
+    monkeypatch.setenv("REFLEX_PERSIST_WEB_DIR", "1")
+
+    monkeypatch.setenv("REFLEX_WEB_LAZY_ROUTES", "1")
+    monkeypatch.setattr(lazy, "is_prod_mode", lambda: False)
+    monkeypatch.setattr(lazy, "ROUTES_FILE", tmp_path / "lazy_routes.json")
+    monkeypatch.setattr(lazy, "APP_MODULE", tmp_path / "app.py")
+    monkeypatch.setattr(lazy, "_built_routes", None)
+
+    (tmp_path / "docs").mkdir()
+    (tmp_path / DOC).write_text("# Page\n")
+    OUTPUT.parent.mkdir(parents=True)
+    yield
+    manifest.file_digest.cache_clear()
+    manifest.expand.cache_clear()
+
+
+def should_skip_compile() -> bool:
+    return manifest.should_skip_compile(DOC, ROUTE, cache.parse_file(DOC))
+
+
+def reload():
+    """Start the app again, as the dev server does after a visit."""
+    lazy._built_routes = None
+
+
+def compile_page(content: str):
+    OUTPUT.write_text(content)
+
+
+def test_placeholder_is_compiled_on_visit(site):
+    # The page is not built yet, so its placeholder is compiled.
+    assert not should_skip_compile()
+    compile_page("placeholder")
+
+    # The visit builds the page on the next reload.
+    lazy.add_built_route(ROUTE)
+    reload()
+    assert not should_skip_compile()
+    compile_page("page")
+
+    # Once compiled, the page is skipped until it changes.
+    reload()
+    assert should_skip_compile()
+
+
+def test_placeholder_replaces_a_compiled_page(site):
+    lazy.add_built_route(ROUTE)
+    reload()
+    assert not should_skip_compile()
+    compile_page("page")
+
+    # The list of visited pages is reset, so the placeholder is compiled over the page.
+    lazy.ROUTES_FILE.unlink()
+    reload()
+    assert not should_skip_compile()
+    compile_page("placeholder")
+
+    lazy.add_built_route(ROUTE)
+    reload()
+    assert not should_skip_compile()
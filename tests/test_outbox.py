@@ -0,0 +1,63 @@
+"""Tests for the form submission outbox."""
+
+import sys
+from datetime import timedelta
+from pathlib import Path
+
+import httpx
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from pcweb import outbox  # noqa: E402
+
+
+def test_backoff_doubles_up_to_the_limit():
+    assert outbox.get_backoff(1) == outbox.BASE_BACKOFF
+    assert outbox.get_backoff(3) == outbox.BASE_BACKOFF * 4
+    assert outbox.get_backoff(100) == outbox.MAX_BACKOFF
+
+
+def test_outcome(monkeypatch):
+    monkeypatch.setattr(outbox, "MAX_ATTEMPTS", 3)
+    message = outbox.OutboxMessage(id=1, destination="sales", payload="{}")
+
+    delivered = outbox.get_outcome(message, None)
+    assert delivered["next_attempt_at"] is None
+    assert delivered["delivered_at"] is not None
+
+    failed = outbox.get_outcome(message, ValueError("boom"))
+    assert failed["attempts"] == 1
+    assert failed["last_error"] == "boom"
+    assert failed["next_attempt_at"] - message.date_created >= timedelta(seconds=9)
+
+    message.attempts = 2
+    assert outbox.get_outcome(message, ValueError("boom"))["next_attempt_at"] is None
+
+
+def status_error(status_code: int) -> httpx.HTTPStatusError:
+    request = httpx.Request("POST", "https://example.com")
+    response = httpx.Response(status_code, request=request)
+    return httpx.HTTPStatusError("error", request=request, response=response)
+
+
+def test_permanent_failures_are_given_up_on_right_away():
+    message = outbox.OutboxMessage(id=1, destination="loops", payload="{}")
+    for error in [outbox.NotConfiguredError("no key"), status_error(404)]:
+        assert outbox.is_permanent(error)
+        assert outbox.get_outcome(message, error)["next_attempt_at"] is None
+    for error in [status_error(429), status_error(408), status_error(502)]:
+        assert not outbox.is_permanent(error)
+        assert outbox.get_outcome(message, error)["next_attempt_at"] is not None
+
+
+def test_unconfigured_destinations(monkeypatch):
+    monkeypatch.delenv("LOOPS_API_KEY", raising=False)
+    monkeypatch.setattr(outbox, "REFLEX_DEV_WEB_GENERAL_FORM_FEEDBACK_WEBHOOK_URL", None)
+    assert not outbox.is_configured("loops")
+    assert not outbox.is_configured("feedback")
+    assert outbox.is_configured("sales")
+    # Nothing is stored for them.
+    outbox.enqueue(("loops", {"email": "a@example.com"}), ("feedback", {}))
+
+    monkeypatch.setenv("LOOPS_API_KEY", "key")
+    assert outbox.is_configured("loops")
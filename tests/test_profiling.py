@@ -0,0 +1,16 @@
+"""Tests for the startup profiler."""
+
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from pcweb import profiling  # noqa: E402
+
+
+def test_check_budget():
+    report = {"total": 30.0, "phases": {"parse": 2.0, "compile": 25.0}}
+    assert profiling.check_budget(report, {"parse": 5, "compile": 30}) == []
+
+    errors = profiling.check_budget(report, {"compile": 20, "render": 1, "total": 40})
+    assert errors == ["compile took 25.00s, over its budget of 20.00s"]
@@ -0,0 +1,67 @@
+"""Tests for the page whitelist."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from pcweb import whitelist  # noqa: E402
+
+
+@pytest.fixture
+def configure(monkeypatch):
+    def configure(pages=(), include="", exclude=""):
+        monkeypatch.setattr(whitelist, "WHITELISTED_PAGES", list(pages))
+        monkeypatch.setenv("REFLEX_WEB_WHITELIST", include)
+        monkeypatch.setenv("REFLEX_WEB_EXCLUDE", exclude)
+        monkeypatch.setattr(whitelist, "_include", None)
+        monkeypatch.setattr(whitelist, "_exclude", None)
+        monkeypatch.setattr(whitelist, "_extra_paths", set())
+
+    return configure
+
+
+def test_empty_whitelist_builds_everything(configure):
+    configure()
+    assert not whitelist.is_whitelist_active()
+    assert whitelist._check_whitelisted_path("/docs/state/overview/")
+
+
+def test_prefix_and_glob_patterns(configure):
+    configure(
+        pages=["/docs/getting-started"],
+        include="/docs/library/**/button, /blog/*",
+        exclude="/docs/getting-started/installation",
+    )
+    check = whitelist._check_whitelisted_path
+    assert check("/")
+    assert check("/docs/getting-started/introduction/")
+    assert not check("/docs/getting-started/installation/")
+    assert check("/docs/library/forms/button/")
+    assert not check("/docs/library/forms/buttons/")
+    assert check("/blog/2024-01-01-post/")
+    assert not check("/blog/a/b/")
+    assert not check("/docs/state/overview/")
+
+
+def test_root_only(configure):
+    configure(pages=["/"])
+    assert whitelist._check_whitelisted_path("/")
+    assert not whitelist._check_whitelisted_path("/docs/state/overview/")
+
+
+def test_linked_pages(configure):
+    configure(include="/docs/state/overview")
+    whitelist.add_whitelisted_paths(["/docs/vars/base-vars/"])
+    assert whitelist._check_whitelisted_path("/docs/vars/base-vars/")
+    assert not whitelist._check_whitelisted_path("/docs/vars/computed-vars/")
+
+
+def test_exclude_only(configure):
+    configure(exclude="/docs/state")
+    assert whitelist.is_whitelist_active()
+    assert not whitelist.has_whitelist()
+    assert whitelist.is_excluded("/docs/state/overview/")
+    assert not whitelist.is_excluded("/docs/vars/base-vars/")